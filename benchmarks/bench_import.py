@@ -0,0 +1,76 @@
+"""Mide lo que cuesta a ComfyUI registrar los nodos de Suno.
+
+Uso (desde la raíz del repositorio)::
+
+    python benchmarks/bench_import.py [--repeat N]
+
+Cada medida se hace en un intérprete nuevo que carga el paquete igual que
+ComfyUI (por ruta, con ``folder_paths`` disponible) y comprueba que al
+registrar los nodos no se carga ninguno de los módulos pesados de
+``HEAVY_MODULES``. Termina con código 1 si alguno aparece, para que la
+mejora no se pierda sin que nadie lo note. Como referencia también mide la
+carga completa del cliente, que ahora se paga en la primera ejecución.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos que no deben cargarse solo por registrar los nodos
+HEAVY_MODULES = ("curl_cffi", "pydantic", "requests", "dotenv", "asyncio", "fastapi")
+
+# Se ejecuta en un intérprete nuevo. ComfyUI aporta ``folder_paths``; fuera de
+# ComfyUI se registra un sustituto mínimo, que importar los nodos no llega a usar.
+_PROBE = r"""
+import importlib.util, json, sys, time, types
+root, heavy, full = sys.argv[1], sys.argv[2].split(","), sys.argv[3] == "1"
+try:
+    import folder_paths
+except ImportError:
+    sys.modules["folder_paths"] = types.ModuleType("folder_paths")
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location("suno_nodes", f"{root}/__init__.py", submodule_search_locations=[root])
+package = importlib.util.module_from_spec(spec)
+sys.modules["suno_nodes"] = package
+spec.loader.exec_module(package)
+if full:
+    importlib.import_module("suno_nodes.suno.accounts")
+    importlib.import_module("suno_nodes.suno.downloader")
+elapsed = time.perf_counter() - start
+loaded = sorted(name for name in heavy if name in sys.modules)
+print(json.dumps({"seconds": elapsed, "nodes": len(package.NODE_CLASS_MAPPINGS), "loaded": loaded}))
+"""
+
+
+def probe(full: bool) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE, ROOT, ",".join(HEAVY_MODULES), "1" if full else "0"],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {}
+    for label, full in (("registro de nodos", False), ("cliente completo", True)):
+        runs = [probe(full) for _ in range(args.repeat)]
+        results[label] = runs[-1]
+        median = statistics.median(run["seconds"] for run in runs)
+        print(f"{label:<18} {median * 1000:8.1f} ms  módulos pesados: {', '.join(runs[-1]['loaded']) or '-'}")
+
+    loaded = results["registro de nodos"]["loaded"]
+    if loaded:
+        print(f"ERROR: registrar los nodos carga {', '.join(loaded)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
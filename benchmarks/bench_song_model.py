@@ -0,0 +1,101 @@
+"""Compara la construcción de Song validada con la ruta rápida de ``_song_from_clip``.
+
+Uso (desde la raíz del repositorio)::
+
+    python benchmarks/bench_song_model.py [--repeat N]
+
+Los clips imitan las respuestas reales de ``/feed`` (incluidos los campos que
+Song ignora) y se miden con tamaños de feed habituales.
+"""
+import argparse
+import copy
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from suno.suno_client import Song, _song_from_clip  # noqa: E402
+
+FEED_SIZES = (20, 500, 5000)
+
+
+def make_clip(index: int) -> dict:
+    clip_id = str(uuid.uuid4())
+    return {
+        "id": clip_id,
+        "video_url": f"https://cdn1.suno.ai/{clip_id}.mp4",
+        "audio_url": f"https://cdn1.suno.ai/{clip_id}.mp3",
+        "image_url": f"https://cdn2.suno.ai/image_{clip_id}.jpeg",
+        "image_large_url": f"https://cdn2.suno.ai/image_large_{clip_id}.jpeg",
+        "is_video_pending": False,
+        "major_model_version": "v3",
+        "model_name": "chirp-v3",
+        "metadata": {
+            "tags": "lofi, chill, instrumental",
+            "prompt": f"[Verse]\nLínea {index} de una canción de prueba\n" * 4,
+            "gpt_description_prompt": "lofi para estudiar",
+            "audio_prompt_id": None,
+            "history": None,
+            "concat_history": None,
+            "type": "gen",
+            "duration": 120.5 + index % 60,
+            "refund_credits": False,
+            "stream": True,
+            "error_type": None,
+            "error_message": None,
+        },
+        "is_liked": index % 3 == 0,
+        "user_id": str(uuid.uuid4()),
+        "display_name": "tester",
+        "handle": "tester",
+        "is_handle_updated": False,
+        "avatar_image_url": "https://cdn1.suno.ai/defaultPink.jpg",
+        "is_trashed": False,
+        "reaction": None,
+        "created_at": "2024-05-01T10:00:00.000Z",
+        "status": "complete",
+        "title": f"Canción {index}",
+        "play_count": index * 7,
+        "upvote_count": index % 11,
+        "is_public": index % 2 == 0,
+    }
+
+
+def validated(clip: dict) -> Song:
+    """Comportamiento anterior: mutar el clip y validar todos los campos."""
+    clip["cover_image_url"] = clip.get("image_large_url")
+    return Song(**clip)
+
+
+def bench(fn, clips: list, repeat: int) -> float:
+    """Mejor tiempo (s) de ``repeat`` pasadas sobre una copia fresca del feed."""
+    best = float("inf")
+    for _ in range(repeat):
+        feed = copy.deepcopy(clips)
+        start = time.perf_counter()
+        for clip in feed:
+            fn(clip)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'clips':>6} {'validado (ms)':>14} {'rápido (ms)':>12} {'µs/clip':>12} {'mejora':>7}")
+    for size in FEED_SIZES:
+        clips = [make_clip(i) for i in range(size)]
+        slow = bench(validated, clips, args.repeat)
+        fast = bench(_song_from_clip, clips, args.repeat)
+        print(
+            f"{size:>6} {slow * 1000:>14.2f} {fast * 1000:>12.2f} "
+            f"{slow / size * 1e6:>5.1f}→{fast / size * 1e6:<5.1f} {slow / fast:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,12 @@
-import requests
-# The above Python code is attempting to import the `suno_client` module from the `suno` package using
-# a relative import. The `from .suno.suno_client import *` statement is trying to import all objects
-# (functions, classes, variables) from the `suno_client` module within the `suno` package.
-from .suno.suno_client import *
-import json
 import os
+import time
+from urllib.parse import urlencode
 import folder_paths
 
-from .suno.suno_client import *
+# Solo se importa lo ligero al registrar los nodos: el cliente (curl_cffi,
+# pydantic) y requests se cargan dentro de cada nodo en su primera ejecución
+from .suno.config import AVAILABLE_MODELS
+from .suno.serialization import dumps, loads
 
 # Los nodos originales se mantienen sin cambios
 class SunoAIGenerator:
@@ -28,7 +27,7 @@ class SunoAIGenerator:
                 "negative_tags": ("STRING", {"default": ""}),
                 "title": ("STRING", {"default": "Song Title"}),
                 "instrumental": ("BOOLEAN", {"default": False}),
-                "model": (list(SunoConfig.AVAILABLE_MODELS.keys()), {
+                "model": (list(AVAILABLE_MODELS.keys()), {
                     "default": "chirp-v3-5",
                     "display_name": "Generation Model",
                     "description": "Select the Suno AI model for song generation"
@@ -55,13 +54,15 @@ class SunoAIGenerator:
             suno_cookie
         ):
         try:
-            # Inicializar cliente Suno con cookie proporcionada
-            suno_client = Suno(cookie=suno_cookie)
+            from .suno.accounts import get_account_pool
+
+            # Con varias cookies (una por línea) cada generación va a la cuenta menos cargada
+            accounts = get_account_pool(suno_cookie)
             
             # Generar canciones solo si custom es True, de lo contrario solo se usan los campos principales
             if custom:
                 # Generar canciones personalizadas (con tags, negative_tags, etc.)
-                generated_songs = suno_client.songs.generate(
+                generated_songs = accounts.generate(
                     prompt=prompt,
                     custom=custom,
                     tags=tags,
@@ -72,7 +73,7 @@ class SunoAIGenerator:
                 )
             else:
                 # Generar canciones sin campos personalizados
-                generated_songs = suno_client.songs.generate(
+                generated_songs = accounts.generate(
                     prompt=prompt,
                     custom=custom,
                     instrumental=instrumental,
@@ -87,14 +88,101 @@ class SunoAIGenerator:
             clip_ids = [song.id for song in generated_songs]
 
             # Convertir la respuesta completa a una cadena JSON
-            full_json_response = json.dumps(generated_songs, default=lambda o: o.__dict__, indent=4)
+            full_json_response = dumps(generated_songs, indent=True)
 
             # Retornar los IDs de los dos primeros clips
             return clip_ids[0], clip_ids[1], full_json_response
         
         except Exception as e:
             print(f"Song generation error: {e}")
-            return "", ""
+            return "", "", "{}"
+
+def _parse_prompts(text):
+    """Lista de prompts desde un array JSON (de textos u objetos) o un texto con un prompt por línea."""
+    text = text.strip()
+    if text.startswith("["):
+        prompts = loads(text)
+        if not isinstance(prompts, list):
+            raise ValueError("Prompts JSON must be a list")
+        return [p for p in prompts if p]
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+class SunoAIBatchGenerator:
+    """Genera varios prompts a la vez con un límite de generaciones simultáneas"""
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                # Un prompt por línea, o un array JSON de textos u objetos con argumentos de generación
+                "prompts": ("STRING", {"default": "", "multiline": True}),
+                "custom": ("BOOLEAN", {"default": False}),
+                "max_concurrency": ("INT", {"default": 4, "min": 1, "max": 16, "step": 1}),
+            },
+            "optional": {
+                "tags": ("STRING", {"default": ""}),
+                "negative_tags": ("STRING", {"default": ""}),
+                "instrumental": ("BOOLEAN", {"default": False}),
+                "model": (list(AVAILABLE_MODELS.keys()), {
+                    "default": "chirp-v3-5",
+                    "display_name": "Generation Model",
+                    "description": "Select the Suno AI model for song generation"
+                }),
+                "suno_cookie": ("STRING", {"multiline": True, "default": ""}),
+            }
+        }
+
+    RETURN_TYPES = ("STRING", "JSON")
+    RETURN_NAMES = ("clip_ids", "response")
+    FUNCTION = "generate_batch"
+    OUTPUT_NODE = True
+    CATEGORY = "Mideas_SunoAI"
+
+    def generate_batch(
+            self,
+            prompts,
+            custom,
+            max_concurrency,
+            tags="",
+            negative_tags="",
+            instrumental=False,
+            model="chirp-v3-5",
+            suno_cookie=""
+        ):
+        try:
+            from .suno.accounts import get_account_pool
+
+            prompt_list = _parse_prompts(prompts)
+            if not prompt_list:
+                raise ValueError("At least one prompt is required")
+
+            options = {"custom": custom, "instrumental": instrumental, "model": model}
+            if custom:
+                options.update(tags=tags, negative_tags=negative_tags)
+
+            # Con varias cookies los prompts se reparten entre las cuentas
+            results = get_account_pool(suno_cookie).generate_batch(
+                prompt_list, max_concurrency=max_concurrency, **options
+            )
+
+            clip_ids = [song.id for result in results for song in result.songs]
+            failed = sum(1 for result in results if not result.ok)
+            print(f"Batch finished: {len(clip_ids)} clips from {len(results) - failed}/{len(results)} prompts")
+
+            full_json_response = dumps([
+                {
+                    "prompt": result.prompt,
+                    "clips": result.songs,
+                    "error": None if result.ok else str(result.error),
+                }
+                for result in results
+            ], indent=True)
+
+            return "\n".join(clip_ids), full_json_response
+
+        except Exception as e:
+            print(f"Batch generation error: {e}")
+            return "", "[]"
 
 class SunoAudioManager:
     def __init__(self):
@@ -152,8 +240,11 @@ class SunoAudioManager:
             if not suno_cookie:
                 raise ValueError("Authorization token is required")
 
-            # Inicializar cliente Suno con el token proporcionado
-            suno_client = Suno(cookie=suno_cookie)
+            from .suno.accounts import get_account_pool
+            from .suno.downloader import Downloader, EXTENSIONS
+
+            # Cliente de la cuenta dueña del clip, buscándolo en cada cuenta si hace falta
+            suno_client = get_account_pool(suno_cookie).client_for(audio_id)
             self._client = suno_client  # Almacenar cliente para usar en `wait_for_file`
             downloader = Downloader()
 
@@ -170,25 +261,36 @@ class SunoAudioManager:
             if download_image:
                 types_to_download.append("image")
 
-            # Procesar cada tipo seleccionado
-            for file_type in types_to_download:
+            # Una sola espera sigue todos los tipos pedidos: la descarga de cada
+            # archivo arranca en segundo plano en cuanto aparece su URL
+            downloads = {}
+
+            def on_ready(file_type, song):
+                urls[file_type] = {
+                    "audio": song.audio_url,
+                    "video": song.video_url,
+                    "image": song.cover_image_url,
+                }[file_type]
+                print(f"Downloading {file_type} file...")
+                extension = EXTENSIONS[file_type]
+                downloads[file_type] = downloader.submit(song, file_type, root=self.output_dir, name=f"{audio_id}.{extension}")
+
+            if types_to_download:
+                print(f"Waiting for {', '.join(types_to_download)} to be ready...")
+                watch = suno_client.songs.watch_files(
+                    audio_id, types_to_download, on_ready,
+                    timeout=max_wait_time * check_interval, interval=check_interval
+                )
                 try:
-                    print(f"Waiting for {file_type} to be ready...")
-                    song = suno_client.songs.wait_for_file(audio_id, file_type, max_wait_time, check_interval)
-
-                    # Obtener la URL correspondiente
-                    if file_type == "audio":
-                        urls[file_type] = song.audio_url
-                    elif file_type == "video":
-                        urls[file_type] = song.video_url
-                    elif file_type == "image":
-                        urls[file_type] = song.cover_image_url
-
-                    # Descargar el archivo
-                    print(f"Downloading {file_type} file...")
-                    extension = {"audio": "mp3", "video": "mp4", "image": "jpg"}[file_type]
-                    file_path = os.path.join(self.output_dir, f"{audio_id}.{extension}")
-                    file_path = downloader.download(song, file_type, root=self.output_dir, name=f"{audio_id}.{extension}")
+                    watch.result()
+                except Exception as e:
+                    missing = [t for t in types_to_download if t not in downloads]
+                    print(f"Error waiting for {', '.join(missing)}: {e}")
+
+            # Esperar a que terminen las descargas en paralelo
+            for file_type, future in downloads.items():
+                try:
+                    file_path = future.result()
 
                     # Verificar la descarga
                     if not os.path.exists(file_path):
@@ -198,7 +300,7 @@ class SunoAudioManager:
                     print(f"{file_type.capitalize()} downloaded to: {paths[file_type]}")
 
                 except Exception as e:
-                    print(f"Error processing {file_type}: {e}")
+                    print(f"Error downloading {file_type}: {e}")
                     import traceback
                     traceback.print_exc()
 
@@ -238,6 +340,7 @@ class SunoProxyNode:
                 "negative_tags": ("STRING", {"default": ""}),
                 "title": ("STRING", {"default": ""}),
                 "instrumental": ("BOOLEAN", {"default": False}),
+                "use_jobs": ("BOOLEAN", {"default": False}),
             }
         }
 
@@ -247,7 +350,9 @@ class SunoProxyNode:
     CATEGORY = "Mideas_SunoAI"
 
     def generate_music(self, prompt, cookie, api_url="http://localhost:8000", model="chirp-v3-5", 
-                      custom=False, tags="", negative_tags="", title="", instrumental=False):
+                      custom=False, tags="", negative_tags="", title="", instrumental=False, use_jobs=False):
+        import requests
+
         try:
             # Preparar los datos para la solicitud
             data = {
@@ -261,19 +366,24 @@ class SunoProxyNode:
                 "title": title if custom else ""
             }
 
-            # Hacer la solicitud al endpoint de generación
-            response = requests.post(
-                f"{api_url}/generate",
-                json=data,
-                headers={"Content-Type": "application/json"},
-                timeout=300
-            )
-            
-            # Verificar si la solicitud fue exitosa
-            response.raise_for_status()
-            
-            # Obtener las canciones generadas
-            songs = response.json()
+            if use_jobs:
+                # Encolar un trabajo y consultar su estado en lugar de mantener
+                # la conexión abierta durante toda la generación
+                songs = self._run_job(api_url, data)
+            else:
+                # Hacer la solicitud al endpoint de generación
+                response = requests.post(
+                    f"{api_url}/generate",
+                    json=data,
+                    headers={"Content-Type": "application/json"},
+                    timeout=300
+                )
+                
+                # Verificar si la solicitud fue exitosa
+                response.raise_for_status()
+                
+                # Obtener las canciones generadas
+                songs = response.json()
             
             # Validar que se hayan generado canciones
             if not songs or len(songs) < 2:
@@ -283,7 +393,7 @@ class SunoProxyNode:
             clip_ids = [song["id"] for song in songs[:2]]
 
             # Convertir la respuesta completa a una cadena JSON
-            full_json_response = json.dumps(songs, indent=4)
+            full_json_response = dumps(songs, indent=True)
 
             # Retornar los IDs de los dos primeros clips y la respuesta completa
             return (clip_ids[0], clip_ids[1], full_json_response)
@@ -295,6 +405,27 @@ class SunoProxyNode:
                 print(f"Response content: {e.response.text}")
             return ("", "", "{}")
 
+    def _run_job(self, api_url, data, poll_interval=2, timeout=300):
+        """Envía la generación a /jobs y espera a que el trabajo termine."""
+        import requests
+
+        response = requests.post(f"{api_url}/jobs", json={**data, "wait_for": None}, timeout=30)
+        response.raise_for_status()
+        job = response.json()
+
+        deadline = time.time() + timeout
+        while job["status"] not in ("complete", "failed"):
+            if time.time() > deadline:
+                raise TimeoutError(f"Job {job['id']} did not finish in {timeout}s")
+            time.sleep(poll_interval)
+            response = requests.get(f"{api_url}/jobs/{job['id']}", timeout=30)
+            response.raise_for_status()
+            job = response.json()
+
+        if job["status"] == "failed":
+            raise RuntimeError(f"Job {job['id']} failed: {job.get('error')}")
+        return job["clips"]
+
 class SunoProxyDownloadNode:
     """Node for downloading files using the Suno API proxy with local file storage"""
     
@@ -312,6 +443,9 @@ class SunoProxyDownloadNode:
                 "api_url": ("STRING", {"default": "http://localhost:8080"}),
                 "file_type": (["audio", "video", "image"], {"default": "audio"}),
                 "download_file": ("BOOLEAN", {"default": True}),
+            },
+            "optional": {
+                "download_via_proxy": ("BOOLEAN", {"default": False}),
             }
         }
 
@@ -320,7 +454,11 @@ class SunoProxyDownloadNode:
     FUNCTION = "download_file"
     CATEGORY = "Suno"
 
-    def download_file(self, song_id, cookie, api_url="http://localhost:8000", file_type="audio", download_file=True):
+    def download_file(self, song_id, cookie, api_url="http://localhost:8000", file_type="audio", download_file=True,
+                      download_via_proxy=False):
+        import requests
+        from .suno.downloader import cached_download
+
         try:
             # Get the file URL from the API
             response = requests.get(
@@ -350,14 +488,17 @@ class SunoProxyDownloadNode:
                     # Create local file path
                     local_path = os.path.join(self.output_dir, f"{song_id}.{extension}")
 
-                    # Download the file
+                    # Stream the file to disk, resuming interrupted transfers;
+                    # files already in the local cache are not downloaded again
+                    # With download_via_proxy the bytes come from the proxy's disk
+                    # cache, so the CDN is hit only once for all clients
+                    source = None
+                    if download_via_proxy:
+                        source = f"{api_url}/download/{song_id}?" + urlencode(
+                            {"cookie": cookie, "file_type": file_type, "serve": "true"}
+                        )
                     print(f"Downloading {file_type} {file_url} to {local_path}...")
-                    file_response = requests.get(file_url, timeout=300)
-                    file_response.raise_for_status()
-
-                    # Save the file
-                    with open(local_path, 'wb') as f:
-                        f.write(file_response.content)
+                    local_path = cached_download(file_url, local_path, source=source)
 
                     print(f"Successfully downloaded {file_type} to: {local_path}")
 
@@ -377,6 +518,7 @@ class SunoProxyDownloadNode:
 # Registrar todos los nodos
 NODE_CLASS_MAPPINGS = {
     "Mideas_SunoAI_Generator": SunoAIGenerator,
+    "Mideas_SunoAI_BatchGenerator": SunoAIBatchGenerator,
     "Mideas_SunoAI_AudioManager": SunoAudioManager,
     "Mideas_SunoAI_ProxyNode": SunoProxyNode,
     "Mideas_SunoAI_ProxyDownloadNode": SunoProxyDownloadNode
@@ -384,6 +526,7 @@ NODE_CLASS_MAPPINGS = {
 
 NODE_DISPLAY_NAME_MAPPINGS = {
     "Mideas_SunoAI_Generator": "Suno Generate",
+    "Mideas_SunoAI_BatchGenerator": "Suno Batch Generate",
     "Mideas_SunoAI_AudioManager": "Suno Download",
     "Mideas_SunoAI_ProxyNode": "Suno Proxy Generate",
     "Mideas_SunoAI_ProxyDownloadNode": "Suno Proxy Download"
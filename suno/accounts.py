@@ -0,0 +1,293 @@
+"""Reparto de la generación entre varias cuentas de Suno.
+
+Los nodos y el proxy aceptan varias cookies, una por línea. Cada llamada a
+``generate`` se asigna a la cuenta sana con menos generaciones en curso y
+créditos disponibles; las cuentas que acumulan errores seguidos se apartan
+durante un tiempo y el tráfico se reparte entre las demás.
+
+El pool recuerda qué cuenta generó cada clip para que las consultas y
+descargas posteriores usen la cookie de su dueña.
+"""
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from .async_client import AsyncSuno
+from .registry import get_client
+from .suno_client import (
+    COOKIE,
+    CREDITS_PER_GENERATION,
+    DEFAULT_BATCH_CONCURRENCY,
+    BatchResult,
+    Credits,
+    InsufficientCreditsError,
+    Song,
+    Suno,
+    _cookie_fingerprint,
+    _generate_batch,
+    get_credits_cache,
+)
+
+# Errores seguidos tras los que una cuenta se aparta
+DEFAULT_FAILURE_THRESHOLD = int(os.getenv("SUNO_ACCOUNT_FAILURES", "3"))
+# Segundos que una cuenta apartada pasa sin recibir trabajo
+DEFAULT_COOLDOWN = float(os.getenv("SUNO_ACCOUNT_COOLDOWN", "300"))
+# Clips cuya cuenta de origen se recuerda
+MAX_TRACKED_CLIPS = 10000
+
+
+def split_cookies(cookies: Optional[str]) -> List[str]:
+    """Separa un texto con una cookie por línea; sin cookies usa ``SUNO_COOKIES`` o ``SUNO_COOKIE``."""
+    cookies = cookies or os.getenv("SUNO_COOKIES", "") or COOKIE
+    return list(dict.fromkeys(line.strip() for line in cookies.splitlines() if line.strip()))
+
+
+class Account:
+    """Estado de una cuenta dentro del pool."""
+
+    def __init__(self, cookie: str) -> None:
+        self.cookie = cookie
+        self.fingerprint = _cookie_fingerprint(cookie)
+        self.in_flight = 0
+        self.failures = 0
+        self.unhealthy_until = 0.0
+        self.last_error: Optional[str] = None
+        self.last_used = 0.0
+        self._client: Optional[Suno] = None
+        self._async_client: Optional[AsyncSuno] = None
+
+    @property
+    def client(self) -> Suno:
+        """Cliente síncrono de la cuenta; queda fijado en el registro para que no se cierre."""
+        if self._client is None:
+            self._client = get_client(self.cookie, pin=True)
+        return self._client
+
+    @property
+    def async_client(self) -> AsyncSuno:
+        """Cliente asíncrono de la cuenta, creado en el primer uso; lo usan las lecturas del proxy."""
+        if self._async_client is None:
+            self._async_client = AsyncSuno(self.cookie)
+        return self._async_client
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.unhealthy_until
+
+    @property
+    def has_credits(self) -> bool:
+        """False solo si el último saldo conocido no alcanza para una generación."""
+        credits = get_credits_cache(self.fingerprint).peek()
+        return credits is None or credits.credits_left >= CREDITS_PER_GENERATION
+
+
+class AccountPool:
+    """Elige la cuenta menos cargada entre las sanas y aparta las que fallan."""
+
+    def __init__(
+        self,
+        cookies: List[str],
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        cooldown: float = DEFAULT_COOLDOWN,
+    ) -> None:
+        if not cookies:
+            raise Exception("environment variable SUNO_COOKIE is not set")
+        self.accounts = [Account(cookie) for cookie in cookies]
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._owners: "OrderedDict[str, Account]" = OrderedDict()
+
+    def _pick(self) -> Account:
+        healthy = [account for account in self.accounts if account.healthy]
+        healthy = [account for account in healthy if account.has_credits] or healthy
+        if healthy:
+            return min(healthy, key=lambda account: (account.in_flight, account.last_used))
+        # Todas apartadas: se prueba la que antes vuelve en lugar de fallar sin intentarlo
+        return min(self.accounts, key=lambda account: account.unhealthy_until)
+
+    def acquire(self) -> Account:
+        """Reserva la cuenta que debe atender la próxima generación."""
+        with self._lock:
+            account = self._pick()
+            account.in_flight += 1
+            account.last_used = time.monotonic()
+            return account
+
+    def release(self, account: Account, error: Optional[BaseException] = None) -> None:
+        """Libera la cuenta y actualiza su salud según el resultado."""
+        with self._lock:
+            account.in_flight -= 1
+            if isinstance(error, InsufficientCreditsError):
+                # No es un fallo de la cuenta: la caché de créditos ya la deja de lado
+                return
+            if error is None:
+                account.failures = 0
+                account.unhealthy_until = 0.0
+                return
+            account.failures += 1
+            account.last_error = str(error)
+            if account.failures >= self.failure_threshold:
+                account.unhealthy_until = time.monotonic() + self.cooldown
+                print(f"Cuenta {account.fingerprint[:8]} apartada {self.cooldown:g}s tras {account.failures} errores: {error}")
+
+    @contextmanager
+    def lease(self) -> Iterator[Account]:
+        account = self.acquire()
+        try:
+            yield account
+        except Exception as e:
+            self.release(account, e)
+            raise
+        self.release(account)
+
+    def remember(self, account: Account, songs: List[Song]) -> None:
+        """Anota que los clips de ``songs`` pertenecen a ``account``."""
+        with self._lock:
+            for song in songs:
+                self._owners[song.id] = account
+                self._owners.move_to_end(song.id)
+            while len(self._owners) > MAX_TRACKED_CLIPS:
+                self._owners.popitem(last=False)
+
+    def account_for(self, song_id: Optional[str] = None) -> Account:
+        """Cuenta dueña de ``song_id`` si se conoce; si no, la que elegiría ``acquire``.
+
+        No consulta a Suno: para dar con la dueña de un clip ajeno usa ``owner_of``.
+        """
+        with self._lock:
+            account = self._owners.get(song_id) if song_id else None
+            return account or self._pick()
+
+    def candidates(self) -> List[Account]:
+        """Todas las cuentas, primero las sanas, en el orden en que se prueban."""
+        return sorted(self.accounts, key=lambda account: not account.healthy)
+
+    def known_owner(self, song_id: str) -> Optional[Account]:
+        """Dueña de ``song_id`` si se sabe sin consultar a Suno (o si solo hay una cuenta)."""
+        if len(self.accounts) == 1:
+            return self.accounts[0]
+        with self._lock:
+            return self._owners.get(song_id)
+
+    def owner_of(self, song_id: str) -> Account:
+        """Cuenta dueña de ``song_id``; si no se conoce, la primera cuenta que encuentra el clip.
+
+        Raises:
+            Exception: El error de la última cuenta si ninguna encuentra el clip
+        """
+        account = self.known_owner(song_id)
+        if account is not None:
+            return account
+        error: Optional[Exception] = None
+        for account in self.candidates():
+            try:
+                song = account.client.get_song(song_id)
+            except Exception as e:
+                error = e
+                continue
+            self.remember(account, [song])
+            return account
+        raise error
+
+    def client_for(self, song_id: Optional[str] = None) -> Suno:
+        """Cliente de la dueña de ``song_id`` o, sin clip, el de la cuenta menos cargada."""
+        return self.owner_of(song_id).client if song_id else self.account_for().client
+
+    def check_credits(self) -> None:
+        """Comprueba que alguna cuenta puede generar.
+
+        Raises:
+            InsufficientCreditsError: Si ninguna cuenta tiene créditos suficientes
+        """
+        error: Optional[InsufficientCreditsError] = None
+        for account in self.candidates():
+            try:
+                account.client.check_credits()
+                return
+            except InsufficientCreditsError as e:
+                error = e
+        raise error
+
+    def generate(self, **kwargs: Any) -> List[Song]:
+        """``Songs.generate`` en la cuenta menos cargada; acepta los mismos argumentos.
+
+        Si la cuenta elegida se ha quedado sin créditos se prueba con otra.
+        """
+        for attempt in range(len(self.accounts)):
+            try:
+                with self.lease() as account:
+                    songs = account.client.songs.generate(**kwargs)
+            except InsufficientCreditsError:
+                if attempt == len(self.accounts) - 1:
+                    raise
+                continue
+            self.remember(account, songs)
+            return songs
+
+    async def generate_async(
+        self,
+        run: Callable[[Account, Callable[[], List[Song]]], Awaitable[List[Song]]],
+        **kwargs: Any,
+    ) -> List[Song]:
+        """Como ``generate``, pero cada intento se ejecuta con ``await run(account, call)``.
+
+        El proxy lo usa para lanzar ``call`` en su pool de hilos con el límite
+        de llamadas de la cuenta que la atiende.
+        """
+        for attempt in range(len(self.accounts)):
+            try:
+                with self.lease() as account:
+                    songs = await run(account, functools.partial(account.client.songs.generate, **kwargs))
+            except InsufficientCreditsError:
+                if attempt == len(self.accounts) - 1:
+                    raise
+                continue
+            self.remember(account, songs)
+            return songs
+
+    def generate_batch(
+        self,
+        prompts: List[Union[str, Dict[str, Any]]],
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        **kwargs: Any,
+    ) -> List[BatchResult]:
+        """Como ``Songs.generate_batch``, pero cada prompt va a la cuenta menos cargada."""
+        return _generate_batch(self.generate, prompts, max_concurrency, kwargs)
+
+
+def sum_credits(credits: List[Credits]) -> Credits:
+    """Saldo conjunto de varias cuentas."""
+    if len(credits) == 1:
+        return credits[0]
+
+    def total(field: str) -> Optional[int]:
+        values = [getattr(item, field) for item in credits if getattr(item, field) is not None]
+        return sum(values) if values else None
+
+    periods = {item.period for item in credits}
+    return Credits(
+        credits_left=sum(item.credits_left for item in credits),
+        period=periods.pop() if len(periods) == 1 else None,
+        monthly_limit=total("monthly_limit"),
+        monthly_usage=total("monthly_usage"),
+    )
+
+
+_pools: Dict[Tuple[str, ...], AccountPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_account_pool(cookies: Optional[str] = None) -> AccountPool:
+    """Devuelve el pool compartido para el texto de cookies (una por línea)."""
+    cookie_list = split_cookies(cookies)
+    key = tuple(_cookie_fingerprint(cookie) for cookie in cookie_list)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = AccountPool(cookie_list)
+        return pool
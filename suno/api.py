@@ -1,22 +1,49 @@
-from fastapi import FastAPI, HTTPException, Depends, Query, Path
+from fastapi import FastAPI, HTTPException, Depends, Query, Path, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
-from .suno_client import Suno, SongGenerateParams, Song
+from .suno_client import Credits, InsufficientCreditsError, Suno, SongGenerateParams, Song, SunoRequestError, _cookie_fingerprint
+from .registry import get_client
+from .accounts import get_account_pool, sum_credits
+from .poller import get_poller, wrap_watch
+from .cache import get_asset_cache
+from .downloader import EXTENSIONS, cached_download
+from .jobs import Job, JobManager, JobQueueFull
+from .http_pool import get_session_pool
+from .serialization import dumps, dumps_bytes
+import asyncio
+import functools
+import hashlib
 import logging
-from functools import lru_cache
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# JSON encoding
+# Todas las respuestas JSON se codifican con la capa de serialization (orjson
+# si está instalado) y en formato compacto. Los endpoints calientes devuelven
+# FastJSONResponse directamente para evitar además la revalidación con
+# response_model y jsonable_encoder.
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
+
 app = FastAPI(
     title="Suno API Proxy",
     description="API proxy for Suno AI music generation",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse
 )
 
 # Configure CORS
@@ -28,6 +55,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Optional gzip
+# Con SUNO_PROXY_GZIP=1 se comprimen las respuestas de más de
+# SUNO_PROXY_GZIP_MIN_SIZE bytes. Los eventos SSE se quedarían retenidos en el
+# buffer de gzip y los archivos ya van comprimidos (y admiten Range), así que
+# esas rutas se envían tal cual.
+GZIP_ENABLED = os.getenv("SUNO_PROXY_GZIP", "0").lower() in ("1", "true", "yes")
+GZIP_MIN_SIZE = int(os.getenv("SUNO_PROXY_GZIP_MIN_SIZE", "1024"))
+GZIP_EXCLUDED_PATHS = ("/events", "/download")
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith(GZIP_EXCLUDED_PATHS):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+if GZIP_ENABLED:
+    app.add_middleware(SelectiveGZipMiddleware, minimum_size=GZIP_MIN_SIZE)
+
 # Response Models
 class ErrorResponse(BaseModel):
     detail: str
@@ -39,6 +85,12 @@ class SongResponse(BaseModel):
     audio_url: Optional[str] = None
     video_url: Optional[str] = None
     cover_image_url: Optional[str] = None
+
+_SONG_RESPONSE_FIELDS = tuple(SongResponse.__fields__)
+
+def song_payload(song: Song) -> Dict[str, Any]:
+    """Campos de ``SongResponse`` leídos directamente del Song, sin construir otro modelo."""
+    return {name: getattr(song, name) for name in _SONG_RESPONSE_FIELDS}
     
 class GenerateRequest(BaseModel):
     prompt: str
@@ -48,18 +100,310 @@ class GenerateRequest(BaseModel):
     instrumental: bool = False
     title: Optional[str] = None
     model: str = "chirp-v3-5-tau"
+    # Una o varias cookies (una por línea) entre las que repartir la generación
     cookie: str
 
+class JobRequest(GenerateRequest):
+    wait_for: Optional[str] = "audio"
+    wait_timeout: float = 300
+
+class JobResponse(BaseModel):
+    id: str
+    status: str
+    progress: str = ""
+    clips: List[SongResponse] = []
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
+
 # Client management
-@lru_cache()
 def get_suno_client(cookie: str) -> Suno:
-    return Suno(cookie=cookie)
+    return get_client(cookie)
+
+def account_cookie(cookie: str) -> str:
+    """Cookie de la cuenta que debe atender la petición.
+
+    ``cookie`` puede traer varias cookies, una por línea: se usa la menos
+    cargada del pool.
+    """
+    return get_account_pool(cookie).account_for().cookie
+
+async def owner_cookie(cookie: str, song_id: str) -> str:
+    """Cookie de la cuenta dueña de ``song_id``; si no se conoce, se busca el clip en cada cuenta.
+
+    Equivale a ``AccountPool.owner_of``, con cada consulta sujeta al límite de su cuenta.
+    """
+    accounts = get_account_pool(cookie)
+    account = accounts.known_owner(song_id)
+    if account is not None:
+        return account.cookie
+    error: Optional[Exception] = None
+    for account in accounts.candidates():
+        try:
+            song = await run_upstream(account.cookie, account.async_client.get_song, song_id)
+        except Exception as e:
+            error = e
+            continue
+        accounts.remember(account, [song])
+        return account.cookie
+    raise error
+
+async def check_pool_credits(cookie: str) -> None:
+    """Equivalente de ``AccountPool.check_credits``, con cada consulta sujeta al límite de su cuenta."""
+    error: Optional[InsufficientCreditsError] = None
+    for account in get_account_pool(cookie).candidates():
+        try:
+            await run_upstream(account.cookie, account.async_client.check_credits)
+            return
+        except InsufficientCreditsError as e:
+            error = e
+    raise error
+
+# Upstream execution
+# Las lecturas usan el cliente asíncrono de la cuenta (AsyncSuno) y se esperan
+# en el propio event loop; las llamadas del cliente síncrono (generación) se
+# ejecutan en un pool acotado. Ambas comparten el límite de llamadas por cuenta.
+MAX_UPSTREAM_WORKERS = int(os.getenv("SUNO_PROXY_MAX_WORKERS", "16"))
+MAX_CALLS_PER_ACCOUNT = int(os.getenv("SUNO_PROXY_PER_ACCOUNT", "4"))
+
+_upstream_executor = ThreadPoolExecutor(max_workers=MAX_UPSTREAM_WORKERS, thread_name_prefix="suno-upstream")
+_account_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+def _account_semaphore(cookie: str) -> asyncio.Semaphore:
+    key = _cookie_fingerprint(cookie)
+    semaphore = _account_semaphores.get(key)
+    if semaphore is None:
+        semaphore = _account_semaphores[key] = asyncio.Semaphore(MAX_CALLS_PER_ACCOUNT)
+    return semaphore
+
+async def run_upstream(cookie: str, fn, *args, **kwargs):
+    """Ejecuta una llamada a Suno sin bloquear el event loop.
+
+    Las corrutinas de ``AsyncSuno`` se esperan directamente; las funciones
+    bloqueantes se ejecutan en el pool. ``cookie`` es la de la única cuenta que
+    atiende la llamada: su límite de llamadas simultáneas es el que se aplica.
+    """
+    async with _account_semaphore(cookie):
+        if asyncio.iscoroutinefunction(fn):
+            return await fn(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_upstream_executor, functools.partial(fn, *args, **kwargs))
+
+# Server-side asset cache
+# Con ?serve=true, /download entrega los bytes del archivo desde una caché en
+# disco del proxy, de modo que cada archivo se descarga del CDN una sola vez.
+PROXY_CACHE_DIR = os.getenv("SUNO_PROXY_CACHE_DIR", "proxy_cache")
+MEDIA_TYPES = {"audio": "audio/mpeg", "video": "video/mp4", "image": "image/jpeg"}
+FILE_CHUNK_SIZE = 256 * 1024
+
+# Por URL: el lock de su descarga y cuántas peticiones lo tienen o lo esperan
+_asset_locks: Dict[str, list] = {}
+
+async def fetch_to_proxy_cache(url: str, song_id: str, file_type: str) -> str:
+    """Descarga ``url`` en la caché del proxy, una sola vez aunque haya peticiones simultáneas."""
+    entry = _asset_locks.setdefault(url, [asyncio.Lock(), 0])
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            path = os.path.join(PROXY_CACHE_DIR, f"{song_id}.{EXTENSIONS[file_type]}")
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_upstream_executor, cached_download, url, path)
+    finally:
+        # Las peticiones que lleguen después encontrarán el archivo en la caché
+        entry[1] -= 1
+        if not entry[1]:
+            _asset_locks.pop(url, None)
+
+def _iter_file(path: str, start: int, end: int):
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(FILE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+def file_response(path: str, range_header: Optional[str], media_type: str, etag: Optional[str] = None) -> Response:
+    """Respuesta con el contenido de ``path`` que atiende cabeceras ``Range`` de un solo rango."""
+    size = os.path.getsize(path)
+    headers = {"Accept-Ranges": "bytes"}
+    if etag:
+        headers["ETag"] = etag
+
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", (range_header or "").strip())
+    if not match or not (match.group(1) or match.group(2)):
+        return FileResponse(path, media_type=media_type, headers=headers)
+
+    if match.group(1):
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else size - 1
+    else:
+        start = max(size - int(match.group(2)), 0)
+        end = size - 1
+    end = min(end, size - 1)
+    if start >= size or start > end:
+        return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(_iter_file(path, start, end), status_code=206, media_type=media_type, headers=headers)
+
+# Background jobs
+# POST /jobs devuelve un ID al instante; la generación y la espera de los
+# archivos se ejecutan en un pool acotado y se consultan con GET /jobs/{id}.
+jobs = JobManager(
+    max_workers=int(os.getenv("SUNO_PROXY_JOB_WORKERS", "4")),
+    max_pending=int(os.getenv("SUNO_PROXY_MAX_JOBS", "100")),
+    ttl=float(os.getenv("SUNO_PROXY_JOB_TTL", "3600")),
+)
+
+def _job_response(job: Job) -> JobResponse:
+    return JobResponse(
+        id=job.id,
+        status=job.status,
+        progress=job.progress,
+        clips=job.result,
+        error=job.error,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+    )
+
+def _run_generation_job(job: Job, request: JobRequest) -> None:
+    accounts = get_account_pool(request.cookie)
+    job.update(progress="generating")
+    songs = accounts.generate(
+        prompt=request.prompt,
+        custom=request.custom,
+        tags=request.tags,
+        negative_tags=request.negative_tags,
+        instrumental=request.instrumental,
+        title=request.title,
+        model=request.model
+    )
+    clips = [song_payload(song) for song in songs]
+    job.update(progress=f"generated {len(clips)} clips", result=clips)
+    if not request.wait_for:
+        return
+
+    # Todas las esperas se registran a la vez en el poller compartido
+    watches = [
+        accounts.client_for(song.id).songs.watch_file(song.id, request.wait_for, timeout=request.wait_timeout)
+        for song in songs
+    ]
+    for index, watch in enumerate(watches):
+        clips[index] = song_payload(watch.result())
+        job.update(progress=f"{index + 1}/{len(clips)} clips ready", result=clips)
+
+# Request coalescing
+class SingleFlight:
+    """Comparte una única llamada en vuelo entre todas las peticiones con la misma clave."""
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Any, asyncio.Future] = {}
+
+    async def do(self, key: Any, factory):
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._done(key, f))
+        # shield: si un llamante se cancela, la llamada compartida sigue para los demás
+        return await asyncio.shield(future)
+
+    def _done(self, key: Any, future: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        # Marcar la excepción como recuperada aunque todos los llamantes se hayan ido
+        if not future.cancelled():
+            future.exception()
+
+_song_lookups = SingleFlight()
+
+async def fetch_song(cookie: str, song_id: str) -> Song:
+    """``get_song`` compartido por las peticiones simultáneas de la misma cuenta y canción."""
+    client = get_account_pool(cookie).accounts[0].async_client
+    return await _song_lookups.do(
+        (_cookie_fingerprint(cookie), song_id),
+        lambda: run_upstream(cookie, client.get_song, song_id),
+    )
+
+# Song listing cache
+# /songs se sirve desde una caché por cuenta ya serializada; el ETag es el hash
+# del cuerpo, así que no cambia mientras el feed no cambie.
+SONGS_CACHE_TTL = float(os.getenv("SUNO_PROXY_SONGS_TTL", "10"))
+
+_song_listings: Dict[str, tuple] = {}
+_listing_refreshes = SingleFlight()
+
+async def cached_song_listing(cookie: str) -> tuple:
+    """Devuelve ``(cuerpo JSON, ETag)`` del feed, refrescado como mucho cada TTL.
+
+    Con varias cookies se unen los feeds de todas las cuentas, de la canción
+    más reciente a la más antigua.
+    """
+    accounts = get_account_pool(cookie).accounts
+    key = ",".join(account.fingerprint for account in accounts)
+    cached = _song_listings.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1], cached[2]
+
+    async def refresh() -> tuple:
+        feeds = await asyncio.gather(*(
+            run_upstream(account.cookie, account.async_client.get_songs) for account in accounts
+        ))
+        songs = [song for feed in feeds for song in feed]
+        if len(feeds) > 1:
+            songs.sort(key=lambda song: song.created_at, reverse=True)
+        body = dumps_bytes([song_payload(song) for song in songs])
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        _song_listings[key] = (time.monotonic() + SONGS_CACHE_TTL, body, etag)
+        return body, etag
+
+    return await _listing_refreshes.do(key, refresh)
+
+async def stream_song_feed(cookie: str, max_pages: Optional[int] = None):
+    """Líneas NDJSON con todas las canciones del feed; solo una página en memoria a la vez.
+
+    Con varias cookies se recorre el feed de cada cuenta, una tras otra, y
+    ``max_pages`` limita las páginas de cada una.
+    """
+    for account in get_account_pool(cookie).accounts:
+        page = 0
+        while max_pages is None or page < max_pages:
+            try:
+                songs = await run_upstream(account.cookie, account.async_client.get_songs_page, page)
+            except Exception as e:
+                # La respuesta ya ha empezado: el error se informa como última línea
+                logger.error(f"Error streaming songs page {page}: {str(e)}", exc_info=True)
+                yield dumps({"error": str(e), "page": page}) + "\n"
+                return
+            if not songs:
+                break
+            for song in songs:
+                yield dumps(song_payload(song)) + "\n"
+            page += 1
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    """Si ``If-None-Match`` incluye ``etag`` (comparación débil) o es ``*``."""
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+@app.on_event("shutdown")
+async def shutdown_upstream_executor():
+    _upstream_executor.shutdown(wait=False)
+    jobs.shutdown()
+    pool = get_session_pool()
+    pool.close()
+    await pool.aclose()
 
 # Exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     logger.error(f"Global error: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=500,
         content={"detail": "An internal error occurred", "status_code": 500}
     )
@@ -71,8 +415,10 @@ async def root():
 @app.post("/generate", response_model=List[SongResponse])
 async def generate_song(request: GenerateRequest):
     try:
-        client = get_suno_client(request.cookie)
-        songs = client.songs.generate(
+        # Si la cuenta elegida no tiene créditos, accounts.generate prueba con las demás
+        accounts = get_account_pool(request.cookie)
+        songs = await accounts.generate_async(
+            lambda account, call: run_upstream(account.cookie, call),
             prompt=request.prompt,
             custom=request.custom,
             tags=request.tags,
@@ -81,7 +427,9 @@ async def generate_song(request: GenerateRequest):
             title=request.title,
             model=request.model
         )
-        return [SongResponse(**song.dict()) for song in songs]
+        return FastJSONResponse([song_payload(song) for song in songs])
+    except InsufficientCreditsError as e:
+        raise HTTPException(status_code=402, detail=str(e))
     except Exception as e:
         logger.error(f"Error generating music: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -89,30 +437,76 @@ async def generate_song(request: GenerateRequest):
             detail={"message": "Failed to generate song", "error": str(e)}
         )
 
+@app.post("/jobs", response_model=JobResponse, status_code=202)
+async def submit_job(request: JobRequest):
+    if request.wait_for not in (None, "", "audio", "video", "image"):
+        raise HTTPException(status_code=400, detail="Invalid wait_for file type")
+    # Admisión: sin créditos el trabajo fallaría después de ocupar un worker
+    try:
+        await check_pool_credits(request.cookie)
+    except InsufficientCreditsError as e:
+        raise HTTPException(status_code=402, detail=str(e))
+    try:
+        job = jobs.submit(functools.partial(_run_generation_job, request=request))
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return _job_response(job)
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str = Path(..., description="The ID returned by POST /jobs")):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return _job_response(job)
+
+@app.get("/credits", response_model=Credits)
+async def get_credits(
+    cookie: str = Query(..., description="Authentication cookie"),
+    refresh: bool = Query(False, description="Bypass the short-lived credits cache")
+):
+    accounts = get_account_pool(cookie).accounts
+    try:
+        # Con varias cookies se devuelve el saldo conjunto de todas las cuentas
+        return sum_credits(await asyncio.gather(*(
+            run_upstream(account.cookie, account.async_client.get_credits, refresh) for account in accounts
+        )))
+    except Exception as e:
+        logger.error(f"Error getting credits: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail={"message": "Failed to get credits", "error": str(e)}
+        )
+
 @app.get("/song/{song_id}", response_model=SongResponse)
 async def get_song(
     song_id: str = Path(..., description="The ID of the song to retrieve"),
     cookie: str = Query(..., description="Authentication cookie")
 ):
     try:
-        client = get_suno_client(cookie)
-        song = client.get_song(song_id)
-        return SongResponse(**song.dict())
+        song = await fetch_song(await owner_cookie(cookie, song_id), song_id)
+        return FastJSONResponse(song_payload(song))
     except Exception as e:
         logger.error(f"Error getting song {song_id}: {str(e)}", exc_info=True)
         raise HTTPException(
-            status_code=404 if "not found" in str(e).lower() else 500,
+            status_code=404 if "not found" in str(e).lower() or (isinstance(e, SunoRequestError) and e.status_code == 404) else 500,
             detail={"message": f"Failed to get song {song_id}", "error": str(e)}
         )
 
 @app.get("/songs", response_model=List[SongResponse])
 async def get_songs(
-    cookie: str = Query(..., description="Authentication cookie")
+    request: Request,
+    cookie: str = Query(..., description="Authentication cookie"),
+    stream: bool = Query(False, description="Stream the whole feed, page by page, as NDJSON"),
+    max_pages: Optional[int] = Query(None, description="Maximum number of feed pages to stream")
 ):
+    if stream:
+        return StreamingResponse(stream_song_feed(cookie, max_pages), media_type="application/x-ndjson")
     try:
-        client = get_suno_client(cookie)
-        songs = client.get_songs()
-        return [SongResponse(**song.dict()) for song in songs]
+        body, etag = await cached_song_listing(cookie)
+        headers = {"ETag": etag, "Cache-Control": f"private, max-age={int(SONGS_CACHE_TTL)}"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
     except Exception as e:
         logger.error(f"Error getting songs: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -122,20 +516,33 @@ async def get_songs(
 
 @app.get("/download/{song_id}")
 async def download_song(
+    request: Request,
     song_id: str = Path(..., description="The ID of the song to download"),
     cookie: str = Query(..., description="Authentication cookie"),
-    file_type: str = Query("audio", description="Type of file to download: audio, video, or image")
+    file_type: str = Query("audio", description="Type of file to download: audio, video, or image"),
+    serve: bool = Query(False, description="Return the file bytes from the proxy cache instead of the CDN URL")
 ):
     try:
+        cookie = await owner_cookie(cookie, song_id)
         client = get_suno_client(cookie)
         
+        if file_type not in ("audio", "video", "image"):
+            raise HTTPException(status_code=400, detail="Invalid file type")
+
         # First get the song to verify it exists
-        song = client.get_song(song_id)
+        song = await fetch_song(cookie, song_id)
         if not song:
             raise HTTPException(status_code=404, detail=f"Song {song_id} not found")
             
-        # Wait for the file to be ready
-        song = client.songs.wait_for_file(song_id, file_type)
+        # Wait for the file to be ready: the shared poller does the upstream
+        # calls, so the wait holds neither a worker thread nor the event loop
+        try:
+            song = await wrap_watch(client.songs.watch_file(song_id, file_type, timeout=60))
+        except TimeoutError:
+            raise HTTPException(
+                status_code=504,
+                detail=f"Timed out waiting for {file_type} of song {song_id}"
+            )
         
         # Return the appropriate URL based on file type
         urls = {
@@ -144,17 +551,19 @@ async def download_song(
             "image": song.cover_image_url
         }
         
-        if file_type not in urls:
-            raise HTTPException(status_code=400, detail="Invalid file type")
-            
         url = urls[file_type]
         if not url:
             raise HTTPException(
                 status_code=404,
                 detail=f"{file_type} file not available for song {song_id}"
             )
-            
-        return {"url": url}
+
+        if not serve:
+            return {"url": url}
+
+        path = await fetch_to_proxy_cache(url, song_id, file_type)
+        etag = get_asset_cache(os.path.dirname(path)).etag(url)
+        return file_response(path, request.headers.get("range"), MEDIA_TYPES[file_type], etag)
             
     except HTTPException as he:
         raise he
@@ -163,4 +572,85 @@ async def download_song(
         raise HTTPException(
             status_code=500,
             detail={"message": f"Failed to download {file_type}", "error": str(e)}
-        )
\ No newline at end of file
+        )
+
+# Status subscriptions
+EVENTS_KEEPALIVE = 15
+TERMINAL_STATUSES = ("complete", "error")
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {dumps(data)}\n\n"
+
+@app.get("/events")
+async def song_events(
+    ids: str = Query(..., description="Comma-separated IDs of the songs to follow"),
+    cookie: str = Query(..., description="Authentication cookie"),
+    timeout: float = Query(600, description="Maximum seconds to follow the songs")
+):
+    """Server-Sent Events stream with the status changes and asset URLs of each song.
+
+    Emits a ``song`` event every time a clip changes (``queued`` → ``streaming``
+    → ``complete``), an ``error`` event if a clip fails or times out, and a final
+    ``done`` event. Updates come from the account's shared upstream poller, so
+    subscribers add no upstream traffic of their own.
+    """
+    song_ids = [song_id.strip() for song_id in ids.split(",") if song_id.strip()]
+    if not song_ids:
+        raise HTTPException(status_code=400, detail="At least one song ID is required")
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    watches = []
+
+    for song_id in song_ids:
+        last = {}
+
+        def on_update(song: Song, last=last) -> bool:
+            state = song_payload(song)
+            if state != last:
+                last.clear()
+                last.update(state)
+                loop.call_soon_threadsafe(queue.put_nowait, ("song", state))
+            return song.status in TERMINAL_STATUSES
+
+        def on_done(watch, song_id=song_id) -> None:
+            error = None if watch.error is None else {"id": song_id, "error": str(watch.error)}
+            loop.call_soon_threadsafe(queue.put_nowait, ("finished", error))
+
+        # Con varias cuentas, cada canción se sigue con el poller de su dueña;
+        # si ninguna la encuentra, el propio seguimiento emitirá el error
+        try:
+            song_cookie = await owner_cookie(cookie, song_id)
+        except Exception:
+            song_cookie = account_cookie(cookie)
+        poller = get_poller(get_suno_client(song_cookie))
+        watch = poller.watch(song_id, on_update, timeout=timeout, condition="status")
+        watch.add_done_callback(on_done)
+        watches.append((poller, watch))
+
+    async def stream():
+        pending = len(watches)
+        try:
+            while pending:
+                try:
+                    kind, data = await asyncio.wait_for(queue.get(), EVENTS_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if kind == "song":
+                    yield _sse("song", data)
+                else:
+                    pending -= 1
+                    if data is not None:
+                        yield _sse("error", data)
+            yield _sse("done", {"ids": song_ids})
+        finally:
+            # El cliente puede desconectarse antes de terminar
+            for poller, watch in watches:
+                poller.cancel(watch)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
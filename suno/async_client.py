@@ -0,0 +1,338 @@
+"""Cliente asíncrono de Suno sobre ``curl_cffi.requests.AsyncSession``.
+
+Expone la misma superficie que ``Suno``/``Songs`` (``get_song``,
+``get_songs``, ``iter_songs``, ``generate`` y ``wait_for_file``), pero todas las esperas son
+no bloqueantes y las peticiones comparten la ``AsyncSession`` del event loop
+en el pool de ``http_pool``, de modo que cientos de sondeos pueden estar en
+vuelo desde un solo hilo.
+"""
+import asyncio
+import random
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from curl_cffi.requests import AsyncSession, Response
+
+from .http_pool import AccountCookies, get_session_pool
+from .ratelimit import get_rate_limiter, retry_after_seconds
+from .suno_client import (
+    BROWSER_HEADERS,
+    COOKIE,
+    CREDITS_PER_GENERATION,
+    DEFAULT_RETRY_POLICY,
+    URL_CREDITS,
+    URL_FEED,
+    URL_GENERATE,
+    URL_JWT,
+    URL_SID,
+    Credits,
+    InsufficientCreditsError,
+    RetryPolicy,
+    Song,
+    SunoRequestError,
+    _cookie_fingerprint,
+    _credits_from_billing,
+    _file_url,
+    _generate_payload,
+    _song_from_clip,
+    get_credits_cache,
+    get_token_cache,
+)
+
+
+class AsyncCloudflareBypassClient:
+    """Equivalente asíncrono de ``CloudflareBypassClient``."""
+
+    def __init__(
+        self,
+        cookie: str,
+        proxies: Optional[Dict[str, str]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ) -> None:
+        self.headers = {**BROWSER_HEADERS, "cookie": cookie}
+        self._proxies = proxies
+        self._pool = get_session_pool()
+        self.cookies = AccountCookies(cookie)
+        self.retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+        self.fingerprint = _cookie_fingerprint(cookie)
+        # La caché de SID/JWT se comparte con los clientes síncronos de la misma cuenta
+        self._tokens = get_token_cache(self.fingerprint)
+        self._limiter = get_rate_limiter(self.fingerprint)
+        self._auth_lock = asyncio.Lock()
+
+    async def _get_sid(self) -> str:
+        if self._tokens.sid:
+            return self._tokens.sid
+        async with self._auth_lock:
+            if not self._tokens.sid:
+                response = await self.request("GET", URL_SID, renew_auth=False)
+                self._tokens.sid = response.json()["response"]["last_active_session_id"]
+                print(f"SID: {self._tokens.sid}")
+            return self._tokens.sid
+
+    async def _get_jwt(self, force: bool = False) -> str:
+        stale = self._tokens.jwt
+        jwt = None if force else self._tokens.valid_jwt()
+        if jwt:
+            return jwt
+        sid = await self._get_sid()
+        try:
+            return await self._jwt_for_session(sid, force, stale)
+        except SunoRequestError as e:
+            if e.status_code not in (401, 404):
+                raise
+            # Sesión de Clerk revocada o rotada: se repite con un SID nuevo
+            print(f"La sesión {sid} ya no es válida ({e.status_code}). Obteniendo un SID nuevo...")
+            self._tokens.invalidate(sid)
+            return await self._jwt_for_session(await self._get_sid(), force, stale)
+
+    async def _jwt_for_session(self, sid: str, force: bool, stale: Optional[str]) -> str:
+        async with self._auth_lock:
+            # Otra corrutina puede haberlo renovado mientras esperábamos el lock
+            jwt = self._tokens.valid_jwt()
+            if jwt and (not force or jwt != stale):
+                return jwt
+            response = await self.request("POST", URL_JWT.format(sid=sid), renew_auth=False)
+            jwt = response.json().get("jwt")
+            self._tokens.store_jwt(jwt)
+            print(f"JWT obtenido: {jwt[:20]}...")
+            return jwt
+
+    async def _renew(self) -> None:
+        """Renueva el JWT y actualiza los headers de autorización."""
+        try:
+            cached = self._tokens.valid_jwt()
+            if "Authorization" not in self.headers and cached:
+                # Cliente nuevo sin Authorization: basta con el JWT vigente de la cuenta
+                self.headers["Authorization"] = f"Bearer {cached}"
+                return
+            jwt = await self._get_jwt(force=True)
+            self.headers["Authorization"] = f"Bearer {jwt}"
+            print("Token JWT renovado y headers actualizados")
+        except Exception as e:
+            print(f"Error al renovar JWT: {e}")
+
+    def _is_cloudflare_challenge(self, response: Response) -> bool:
+        return response.status_code in (403, 503) and "cf-" in response.headers
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> Response:
+        """Envía una petición por la sesión compartida con las cabeceras y cookies de esta cuenta."""
+        session: AsyncSession = self._pool.async_session(self._proxies)
+        kwargs["headers"] = {**self.headers, **(kwargs.get("headers") or {}), "cookie": self.cookies.header()}
+        async with self._pool.async_host_slot(url):
+            response = await session.request(method, url, **kwargs)
+        self.cookies.update(response)
+        return response
+
+    async def request(self, method: str, url: str, renew_auth: bool = True, **kwargs: Any) -> Response:
+        """Equivalente asíncrono de ``CloudflareBypassClient.request``, con la misma política de reintentos."""
+        policy = self.retry_policy
+        deadline = time.monotonic() + policy.budget
+        delay = policy.base_delay
+        response: Optional[Response] = None
+        error: Optional[Exception] = None
+        attempt = 0
+
+        while attempt < policy.max_attempts:
+            wait = self._limiter.reserve()
+            if time.monotonic() + wait >= deadline:
+                # La cuenta está en pausa (Retry-After) más allá del presupuesto
+                raise SunoRequestError(
+                    f"La cuenta está en pausa {wait:.1f}s, más de lo que queda del presupuesto de reintentos ({policy.budget:g}s)",
+                    response, attempt,
+                ) from error
+            if wait > 0:
+                await asyncio.sleep(wait)
+            attempt += 1
+            throttled = False
+            kwargs["impersonate"] = "chrome110"
+            try:
+                response = await self._send(method, url, **kwargs)
+                error = None
+            except Exception as e:
+                print(f"Error en la solicitud ({attempt}/{policy.max_attempts}): {e}")
+                error = e
+                if not policy.is_retryable_error(e):
+                    raise SunoRequestError(f"Error no recuperable en {method} {url}: {e}", attempts=attempt) from e
+                if "SSL" in str(e):
+                    kwargs["verify"] = False
+            else:
+                status = response.status_code
+                if status < 400:
+                    return response
+                elif status == 401 and renew_auth:
+                    print(f"Error de autenticación (401). Reintentando... ({attempt}/{policy.max_attempts})")
+                    await self._renew()
+                elif status == 422:
+                    print("Error 422: Captcha requerido")
+                    raise SunoRequestError("Se requiere captcha", response, attempt)
+                elif status == 429:
+                    pause = retry_after_seconds(response.headers.get("Retry-After")) or policy.next_delay(delay)
+                    print(f"Límite de peticiones alcanzado (429). Pausando la cuenta {pause:.1f}s ({attempt}/{policy.max_attempts})")
+                    self._limiter.pause(pause)
+                    throttled = True
+                elif self._is_cloudflare_challenge(response):
+                    pause = random.uniform(5, 8)
+                    if time.monotonic() + pause >= deadline:
+                        raise SunoRequestError(
+                            f"Desafío Cloudflare en {method} {url}: la espera de {pause:.1f}s no cabe en el presupuesto de reintentos",
+                            response, attempt,
+                        )
+                    print(f"Detectado desafío Cloudflare. Reintentando en {pause:.1f}s... ({attempt}/{policy.max_attempts})")
+                    await asyncio.sleep(pause)
+                elif not policy.is_retryable_status(status):
+                    raise SunoRequestError(f"{method} {url} falló con {status}: {response.text[:200]}", response, attempt)
+                else:
+                    print(f"Error {status} transitorio en {method} {url} ({attempt}/{policy.max_attempts})")
+
+            delay = policy.next_delay(delay)
+            # Tras un 429 la pausa se comprueba contra el presupuesto al reservar el siguiente turno
+            if time.monotonic() + (0 if throttled else delay) >= deadline:
+                print(f"Presupuesto de reintentos agotado ({policy.budget:g}s)")
+                break
+            if attempt < policy.max_attempts and not throttled:
+                await asyncio.sleep(delay)
+
+        raise SunoRequestError(
+            f"No se pudo completar la solicitud después de {attempt} intentos",
+            response, attempt,
+        ) from error
+
+    async def close(self) -> None:
+        """Descarta las cookies de la cuenta; las conexiones pertenecen al pool compartido."""
+        self.cookies.clear()
+
+
+class AsyncSuno:
+    """Cliente asíncrono para interactuar con la API de Suno.
+
+    Uso::
+
+        async with AsyncSuno(cookie) as client:
+            songs = await client.songs.generate("lofi para estudiar")
+            song = await client.songs.wait_for_file(songs[0].id)
+    """
+
+    def __init__(self, cookie: Optional[str] = None, **kwargs: Any) -> None:
+        cookie = cookie or COOKIE
+        if not cookie:
+            raise Exception("environment variable SUNO_COOKIE is not set")
+        self._client = AsyncCloudflareBypassClient(cookie, **kwargs)
+        self.songs = AsyncSongs(self)
+
+    async def __aenter__(self) -> "AsyncSuno":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    async def _get_sid(self) -> str:
+        return await self._client._get_sid()
+
+    async def _get_jwt(self) -> str:
+        return await self._client._get_jwt()
+
+    async def request(self, *args: Any, **kwargs: Any) -> Response:
+        return await self._client.request(*args, **kwargs)
+
+    async def close(self) -> None:
+        await self._client.close()
+
+    async def get_credits(self, refresh: bool = False) -> Credits:
+        """Saldo de créditos de la cuenta; comparte la caché con los clientes síncronos."""
+        return await get_credits_cache(self._client.fingerprint).get_async(self._fetch_credits, refresh)
+
+    async def _fetch_credits(self) -> Credits:
+        response = await self.request("GET", URL_CREDITS)
+        if not response.ok:
+            raise Exception(f"failed to get credits: {response.status_code}: {response.text}")
+        return _credits_from_billing(response.json())
+
+    async def check_credits(self, needed: int = CREDITS_PER_GENERATION) -> None:
+        """Equivalente asíncrono de ``Suno.check_credits``."""
+        try:
+            credits = await self.get_credits()
+        except Exception as e:
+            print(f"No se pudo consultar el saldo de créditos: {e}")
+            return
+        if credits.credits_left < needed:
+            raise InsufficientCreditsError(credits.credits_left, needed)
+
+    async def get_song(self, id: str) -> Song:
+        songs = await self.get_songs_by_ids([id])
+        if not songs:
+            raise Exception(f"Song {id} not found")
+        return songs[0]
+
+    async def get_songs_by_ids(self, ids: List[str]) -> List[Song]:
+        """Obtiene varias canciones con una sola petición ``/feed/?ids=a,b,c``."""
+        response = await self.request("GET", f"{URL_FEED}/?ids={','.join(ids)}")
+        if not response.ok:
+            raise Exception(f"Failed to get songs {ids}: {response.status_code}: {response.text}")
+        return [_song_from_clip(song) for song in response.json()]
+
+    async def get_songs(self) -> List[Song]:
+        response = await self.request("GET", URL_FEED)
+        if not response.ok:
+            raise Exception(f"failed to get songs: {response.status_code}: {response.text}")
+        return [_song_from_clip(song) for song in response.json()]
+
+    async def get_songs_page(self, page: int) -> List[Song]:
+        """Obtiene una página del feed; una lista vacía indica que no hay más."""
+        response = await self.request("GET", f"{URL_FEED}/?page={page}")
+        if not response.ok:
+            raise Exception(f"failed to get songs page {page}: {response.status_code}: {response.text}")
+        return [_song_from_clip(song) for song in response.json()]
+
+    async def iter_songs(self, start_page: int = 0, max_pages: Optional[int] = None) -> AsyncIterator[Song]:
+        """Recorre todo el feed página a página, pidiendo cada página solo cuando hace falta."""
+        page = start_page
+        while max_pages is None or page < start_page + max_pages:
+            songs = await self.get_songs_page(page)
+            if not songs:
+                return
+            for song in songs:
+                yield song
+            page += 1
+
+
+class AsyncSongs:
+    """Gestión asíncrona de canciones en Suno."""
+
+    def __init__(self, client: AsyncSuno) -> None:
+        self._client = client
+
+    async def generate(
+        self,
+        prompt: str,
+        custom: bool = False,
+        tags: str = "",
+        negative_tags: str = "",
+        instrumental: bool = False,
+        title: Optional[str] = None,
+        model: str = "chirp-v3-5",
+    ) -> List[Song]:
+        await self._client.check_credits()
+        payload = _generate_payload(
+            prompt, custom, tags, negative_tags, instrumental, title, model,
+            jwt=await self._client._get_jwt(),
+        )
+        response = await self._client.request("POST", URL_GENERATE, json=payload)
+        response.raise_for_status()
+        get_credits_cache(self._client._client.fingerprint).spend(CREDITS_PER_GENERATION)
+        return [_song_from_clip(clip) for clip in response.json().get("clips", [])]
+
+    async def wait_for_file(
+        self, song_id: str, file_type: str = "audio", max_attempts: int = 30, delay: float = 2
+    ) -> Song:
+        """Espera sin bloquear el event loop hasta que el archivo pedido esté disponible."""
+        for attempt in range(max_attempts):
+            song = await self._client.get_song(song_id)
+            if _file_url(song, file_type):
+                return song
+            if song.status == "error":
+                raise Exception(f"La generación de la canción {song_id} falló")
+            print(f"Archivo {file_type} no disponible aún. Intento {attempt + 1}/{max_attempts} (estado: {song.status})")
+            await asyncio.sleep(delay)
+
+        raise Exception(f"Tiempo de espera agotado esperando el archivo {file_type} para la canción {song_id}")
@@ -0,0 +1,139 @@
+"""Caché local de archivos descargados de Suno.
+
+Cada directorio de descargas tiene un índice SQLite con la URL de origen, la
+ruta, el tamaño, el ETag y el último acceso de cada archivo. Si un archivo ya
+está en disco con el tamaño registrado, se devuelve sin tocar la red, y al
+superar el tamaño máximo configurado se eliminan los archivos usados hace
+más tiempo.
+
+Las URLs del CDN de Suno son inmutables para cada recurso de un clip, por lo
+que la clave de cada entrada es el hash de su URL.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+INDEX_NAME = ".suno_cache.sqlite3"
+# Tamaño máximo del directorio de caché en bytes (por defecto 5 GiB)
+DEFAULT_MAX_BYTES = int(os.getenv("SUNO_CACHE_MAX_BYTES", str(5 * 1024 ** 3)))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_access REAL NOT NULL
+)
+"""
+
+
+def _url_key(url: str) -> str:
+    """Clave de un archivo en la caché."""
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+class AssetCache:
+    """Índice de los archivos descargados en ``root`` con expulsión LRU por tamaño."""
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self._db_path = os.path.join(root, INDEX_NAME)
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        with self._connect() as db:
+            db.execute(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self._db_path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def lookup(self, url: str) -> Optional[str]:
+        """Ruta del archivo descargado de ``url``, o None si no está (completo) en disco."""
+        key = _url_key(url)
+        with self._lock, self._connect() as db:
+            row = db.execute("SELECT path, size FROM assets WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            path, size = row
+            if not os.path.exists(path) or os.path.getsize(path) != size:
+                db.execute("DELETE FROM assets WHERE key = ?", (key,))
+                return None
+            db.execute("UPDATE assets SET last_access = ? WHERE key = ?", (time.time(), key))
+            return path
+
+    def etag(self, url: str) -> Optional[str]:
+        with self._lock, self._connect() as db:
+            row = db.execute("SELECT etag FROM assets WHERE key = ?", (_url_key(url),)).fetchone()
+            return row[0] if row else None
+
+    def store(self, url: str, path: str, etag: Optional[str] = None) -> None:
+        """Registra un archivo ya descargado y aplica el límite de tamaño.
+
+        Varias URLs pueden acabar en el mismo archivo (la de streaming y la
+        del CDN de un mismo clip): la última en guardarlo sustituye a las demás.
+        """
+        key = _url_key(url)
+        with self._lock, self._connect() as db:
+            db.execute("DELETE FROM assets WHERE path = ? AND key != ?", (path, key))
+            db.execute(
+                "INSERT OR REPLACE INTO assets (key, url, path, size, etag, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, url, path, os.path.getsize(path), etag, time.time()),
+            )
+            self._evict(db, keep=path)
+
+    def _evict(self, db: sqlite3.Connection, keep: str) -> None:
+        # Cada archivo cuenta una sola vez aunque lo registren varias entradas
+        total = db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT MAX(size) AS size FROM assets GROUP BY path)"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, path, size in db.execute(
+            "SELECT key, path, size FROM assets ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            shared = db.execute(
+                "SELECT 1 FROM assets WHERE path = ? AND key != ? LIMIT 1", (path, key)
+            ).fetchone()
+            if shared:
+                # Otra entrada sigue usando el archivo: solo se olvida esta
+                db.execute("DELETE FROM assets WHERE key = ?", (key,))
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"No se pudo eliminar {path} de la caché: {e}")
+                continue
+            db.execute("DELETE FROM assets WHERE key = ?", (key,))
+            total -= size
+
+
+_caches: Dict[str, AssetCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_asset_cache(root: str) -> AssetCache:
+    """Devuelve la caché compartida del directorio ``root``."""
+    root = os.path.abspath(root)
+    with _caches_lock:
+        cache = _caches.get(root)
+        if cache is None:
+            cache = _caches[root] = AssetCache(root)
+        return cache
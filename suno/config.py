@@ -0,0 +1,17 @@
+"""Configuración ligera compartida por los nodos y el cliente.
+
+Este módulo no importa nada pesado: ComfyUI lo carga al registrar los nodos
+(para la lista de modelos de los desplegables) sin arrastrar curl_cffi ni
+pydantic, que solo se cargan al ejecutar un nodo.
+"""
+
+# Available models with their descriptions
+AVAILABLE_MODELS = {
+    "chirp-v4": "Last generation model",
+    "chirp-v3-5": "Default high-quality model",
+    "chirp-v3-0": "Previous generation model",
+    "chirp-v2-5": "Earlier generation model",
+    # Add more models as they become available
+}
+
+DEFAULT_MODEL = "chirp-v3-5"
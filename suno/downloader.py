@@ -0,0 +1,236 @@
+"""Descarga de archivos de Suno (audio, vídeo e imagen) a disco.
+
+Los archivos se transmiten por bloques a un ``.part`` temporal que se
+renombra de forma atómica al terminar, por lo que la memoria usada no
+depende del tamaño del archivo. Si la transferencia se corta, se reanuda con
+una cabecera ``Range`` desde el último byte escrito.
+"""
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from curl_cffi.requests import Response, Session
+from curl_cffi.requests.exceptions import HTTPError
+
+from .cache import AssetCache, get_asset_cache
+from .http_pool import get_session_pool
+from .suno_client import Song, _file_url
+
+DEFAULT_TIMEOUT = 60
+MAX_RESUMES = 3
+# Descargas simultáneas en segundo plano
+MAX_PARALLEL_DOWNLOADS = int(os.getenv("SUNO_MAX_PARALLEL_DOWNLOADS", "4"))
+
+# Extensión de archivo para cada tipo de recurso
+EXTENSIONS = {"audio": "mp3", "video": "mp4", "image": "jpg"}
+
+_CONTENT_RANGE_RE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+# Content-Range de una respuesta 416: solo trae el tamaño total
+_UNSATISFIED_RANGE_RE = re.compile(r"bytes \*/(\d+)")
+
+
+def _expected_size(response: Response, offset: int) -> Optional[int]:
+    """Tamaño total del archivo según Content-Range o Content-Length, si se conoce."""
+    match = _CONTENT_RANGE_RE.match(response.headers.get("Content-Range", ""))
+    if match and match.group(3) != "*":
+        return int(match.group(3))
+    length = response.headers.get("Content-Length")
+    if length is not None and length.isdigit():
+        return int(length) + offset
+    return None
+
+
+def stream_download(
+    url: str,
+    path: str,
+    session: Optional[Session] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    max_resumes: int = MAX_RESUMES,
+    response_headers: Optional[Dict[str, str]] = None,
+) -> str:
+    """Descarga ``url`` en ``path`` por bloques, reanudando si la conexión se corta.
+
+    Args:
+        url: URL del archivo
+        path: Ruta final del archivo
+        session: Sesión HTTP a reutilizar; por defecto, la del pool compartido
+            (``http_pool``), cuyas conexiones y límite por host comparten
+            también las llamadas a la API
+        timeout: Timeout de conexión y de lectura de cada bloque, en segundos
+        max_resumes: Número máximo de reanudaciones tras un corte
+        response_headers: Si se indica, se rellena con las cabeceras de la última respuesta
+
+    Returns:
+        str: La ruta del archivo descargado
+
+    Raises:
+        IOError: Si el tamaño recibido no coincide con el anunciado por el servidor
+    """
+    pool = get_session_pool()
+    http = session or pool.session()
+    part_path = f"{path}.part"
+    attempt = 0
+
+    while True:
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        try:
+            with pool.host_slot(url), http.stream("GET", url, headers=headers, timeout=(timeout, timeout)) as response:
+                if response.status_code == 416 and offset:
+                    # El .part ya contiene el archivo completo; el Content-Length
+                    # de un 416 es el de su cuerpo, no el del archivo
+                    match = _UNSATISFIED_RANGE_RE.match(response.headers.get("Content-Range", ""))
+                    total = int(match.group(1)) if match else None
+                    if total is None or total == offset:
+                        break
+                    os.remove(part_path)
+                    continue
+                response.raise_for_status()
+
+                if offset and response.status_code != 206:
+                    # El servidor ignoró el Range: empezar de cero
+                    offset = 0
+                expected = _expected_size(response, offset)
+                if response_headers is not None:
+                    response_headers.update(response.headers)
+
+                with open(part_path, "ab" if offset else "wb") as f:
+                    for chunk in response.iter_content():
+                        if chunk:
+                            f.write(chunk)
+
+            size = os.path.getsize(part_path)
+            if expected is not None and size != expected:
+                if size > expected:
+                    os.remove(part_path)
+                raise IOError(f"Descarga incompleta de {url}: {size}/{expected} bytes")
+            break
+
+        except HTTPError:
+            raise
+        except IOError as e:
+            # Cortes de conexión, timeouts y descargas incompletas se reanudan
+            attempt += 1
+            if attempt > max_resumes:
+                raise
+            print(f"Descarga interrumpida ({e}). Reanudando {attempt}/{max_resumes}...")
+            time.sleep(attempt)
+
+    os.replace(part_path, path)
+    return path
+
+
+# Por ruta de destino: el lock de su descarga y cuántos hilos lo tienen o lo esperan
+_destination_locks: Dict[str, list] = {}
+_destination_locks_lock = threading.Lock()
+
+
+@contextmanager
+def destination_lock(path: str) -> Iterator[None]:
+    """Serializa las descargas al mismo ``path``, que comparten su ``.part``."""
+    key = os.path.abspath(path)
+    with _destination_locks_lock:
+        entry = _destination_locks.setdefault(key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _destination_locks_lock:
+            entry[1] -= 1
+            if not entry[1]:
+                _destination_locks.pop(key, None)
+
+
+def cached_download(
+    url: str,
+    path: str,
+    session: Optional[Session] = None,
+    cache: Optional[AssetCache] = None,
+    source: Optional[str] = None,
+) -> str:
+    """Devuelve el archivo de ``url`` desde la caché local o lo descarga en ``path``.
+
+    Por defecto se usa la caché del directorio de ``path``. En un acierto no se
+    hace ninguna petición y se devuelve la ruta registrada, que puede diferir
+    de ``path``. Si se indica ``source``, los bytes se piden ahí (por ejemplo, a
+    la caché del proxy) pero el archivo se indexa bajo ``url``.
+    """
+    cache = cache or get_asset_cache(os.path.dirname(path) or ".")
+    with destination_lock(path):
+        cached = cache.lookup(url)
+        if cached:
+            print(f"Usando archivo en caché: {cached}")
+            return cached
+        return _download_to_cache(url, path, session, cache, source)
+
+
+def _download_to_cache(
+    url: str,
+    path: str,
+    session: Optional[Session],
+    cache: AssetCache,
+    source: Optional[str] = None,
+) -> str:
+    headers: Dict[str, str] = {}
+    stream_download(source or url, path, session=session, response_headers=headers)
+    cache.store(url, path, etag=headers.get("ETag"))
+    return path
+
+
+# ===================== DESCARGADOR ===================== #
+_shared_executor: Optional[ThreadPoolExecutor] = None
+_shared_lock = threading.Lock()
+
+
+def _get_shared_executor() -> ThreadPoolExecutor:
+    """Pool de hilos compartido por todos los Downloader; las conexiones son las de ``http_pool``."""
+    global _shared_executor
+    with _shared_lock:
+        if _shared_executor is None:
+            _shared_executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL_DOWNLOADS, thread_name_prefix="suno-download")
+        return _shared_executor
+
+
+class Downloader:
+    """Descarga en paralelo los recursos (audio, vídeo, imagen) de una canción.
+
+    Los archivos ya presentes en la caché del directorio destino no se vuelven a descargar.
+    """
+
+    def __init__(self, session: Optional[Session] = None, executor: Optional[ThreadPoolExecutor] = None) -> None:
+        self._session = session
+        self._executor = executor or _get_shared_executor()
+
+    def download(self, song: Song, file_type: str, root: str, name: Optional[str] = None) -> str:
+        """Descarga un recurso de ``song`` en ``root`` y devuelve su ruta.
+
+        Raises:
+            ValueError: Si la canción aún no tiene URL para ``file_type``
+        """
+        url = _file_url(song, file_type)
+        if not url:
+            raise ValueError(f"{file_type} file not available for song {song.id}")
+        path = os.path.join(root, name or f"{song.id}.{EXTENSIONS[file_type]}")
+
+        cache = get_asset_cache(root)
+        with destination_lock(path):
+            cached = cache.lookup(url)
+            if cached:
+                print(f"{file_type.capitalize()} en caché: {cached}")
+                return cached
+
+            start = time.monotonic()
+            _download_to_cache(url, path, self._session, cache)
+        elapsed = max(time.monotonic() - start, 1e-6)
+        size = os.path.getsize(path)
+        print(f"{file_type.capitalize()} descargado: {size} bytes en {elapsed:.2f}s ({size / elapsed / 1024:.1f} KB/s)")
+        return path
+
+    def submit(self, song: Song, file_type: str, root: str, name: Optional[str] = None) -> "Future[str]":
+        """Lanza la descarga en segundo plano y devuelve un Future con la ruta."""
+        return self._executor.submit(self.download, song, file_type, root, name)
@@ -0,0 +1,174 @@
+"""Pool de conexiones HTTP compartido por todos los clientes de Suno del proceso.
+
+Antes cada cliente abría su propia sesión de curl_cffi y pagaba DNS, TLS y
+HTTP/2 de nuevo contra ``studio-api.prod.suno.com`` y ``clerk.suno.com``.
+Ahora todos los clientes con la misma configuración de proxy comparten una
+sesión (y, dentro de ella, un handle de curl por hilo con sus conexiones
+keep-alive), con un límite de conexiones simultáneas por host y caché de DNS.
+
+Las sesiones compartidas no guardan cookies: cada cliente envía su propia
+cookie y cabeceras en cada petición y conserva en ``AccountCookies`` las
+cookies que le devuelve Suno, así que las cuentas nunca se mezclan.
+"""
+import asyncio
+import os
+import threading
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+from curl_cffi import CurlOpt
+from curl_cffi.requests import AsyncSession, Response, Session
+
+# Peticiones simultáneas máximas a un mismo host desde todo el proceso
+MAX_CONNECTIONS_PER_HOST = int(os.getenv("SUNO_MAX_CONNECTIONS_PER_HOST", "8"))
+# Segundos que curl conserva las resoluciones DNS
+DNS_CACHE_TTL = int(os.getenv("SUNO_DNS_CACHE_TTL", "300"))
+# Conexiones simultáneas máximas de cada sesión asíncrona compartida
+ASYNC_MAX_CLIENTS = 64
+
+_SESSION_OPTIONS = {
+    "impersonate": "chrome110",
+    "timeout": 30,
+    "discard_cookies": True,
+    "curl_options": {CurlOpt.DNS_CACHE_TIMEOUT: DNS_CACHE_TTL},
+}
+
+ProxyKey = Tuple[Tuple[str, str], ...]
+
+
+def _proxy_key(proxies: Optional[Dict[str, str]]) -> ProxyKey:
+    return tuple(sorted((proxies or {}).items()))
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+class AccountCookies:
+    """Cookies de una cuenta: las de su cookie original más las que Suno le va devolviendo."""
+
+    def __init__(self, cookie: str) -> None:
+        self._initial = cookie
+        self._lock = threading.Lock()
+        self._values = self._parse(cookie)
+
+    @staticmethod
+    def _parse(cookie: str) -> Dict[str, str]:
+        values: Dict[str, str] = {}
+        for part in cookie.split(";"):
+            name, sep, value = part.strip().partition("=")
+            if name and sep:
+                values[name] = value
+        return values
+
+    def header(self) -> str:
+        """Valor de la cabecera ``cookie`` para la próxima petición."""
+        with self._lock:
+            return "; ".join(f"{name}={value}" for name, value in self._values.items())
+
+    def update(self, response: Response) -> None:
+        """Guarda las cookies de ``Set-Cookie`` de una respuesta."""
+        if response.cookies:
+            with self._lock:
+                self._values.update(response.cookies.items())
+
+    def clear(self) -> None:
+        """Vuelve a la cookie original de la cuenta."""
+        with self._lock:
+            self._values = self._parse(self._initial)
+
+
+class SessionPool:
+    """Sesiones compartidas por configuración de proxy y límites de conexiones por host."""
+
+    def __init__(self, max_per_host: int = MAX_CONNECTIONS_PER_HOST) -> None:
+        self.max_per_host = max_per_host
+        self._lock = threading.Lock()
+        self._sessions: Dict[ProxyKey, Session] = {}
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        # Las sesiones asíncronas quedan ligadas al event loop en el que se usan
+        self._async_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[ProxyKey, AsyncSession]]" = weakref.WeakKeyDictionary()
+        self._async_host_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+    def session(self, proxies: Optional[Dict[str, str]] = None) -> Session:
+        """Sesión síncrona compartida para ``proxies``."""
+        key = _proxy_key(proxies)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._sessions[key] = Session(proxies=proxies, **_SESSION_OPTIONS)
+            return session
+
+    def async_session(self, proxies: Optional[Dict[str, str]] = None) -> AsyncSession:
+        """Sesión asíncrona compartida para ``proxies`` en el event loop actual."""
+        loop = asyncio.get_running_loop()
+        key = _proxy_key(proxies)
+        with self._lock:
+            sessions = self._async_sessions.setdefault(loop, {})
+            session = sessions.get(key)
+            if session is None:
+                session = sessions[key] = AsyncSession(
+                    proxies=proxies, max_clients=ASYNC_MAX_CLIENTS, **_SESSION_OPTIONS
+                )
+            return session
+
+    @contextmanager
+    def host_slot(self, url: str) -> Iterator[None]:
+        """Reserva una de las conexiones permitidas hacia el host de ``url``."""
+        if self.max_per_host <= 0:
+            yield
+            return
+        host = _host(url)
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+        with slot:
+            yield
+
+    @asynccontextmanager
+    async def async_host_slot(self, url: str) -> AsyncIterator[None]:
+        """Equivalente asíncrono de ``host_slot`` para el event loop actual."""
+        if self.max_per_host <= 0:
+            yield
+            return
+        loop = asyncio.get_running_loop()
+        host = _host(url)
+        with self._lock:
+            slots = self._async_host_slots.setdefault(loop, {})
+            slot = slots.get(host)
+            if slot is None:
+                slot = slots[host] = asyncio.Semaphore(self.max_per_host)
+        async with slot:
+            yield
+
+    def close(self) -> None:
+        """Cierra las sesiones síncronas; las asíncronas se cierran con ``aclose``."""
+        with self._lock:
+            sessions, self._sessions = list(self._sessions.values()), {}
+        for session in sessions:
+            session.close()
+
+    async def aclose(self) -> None:
+        """Cierra las sesiones asíncronas del event loop actual."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            sessions = list(self._async_sessions.pop(loop, {}).values())
+            self._async_host_slots.pop(loop, None)
+        for session in sessions:
+            await session.close()
+
+
+_pool: Optional[SessionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_session_pool() -> SessionPool:
+    """Devuelve el pool de conexiones del proceso."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SessionPool()
+        return _pool
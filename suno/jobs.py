@@ -0,0 +1,97 @@
+"""Cola de trabajos en segundo plano para el proxy.
+
+Cada trabajo se ejecuta en un pool de hilos acotado y su estado se consulta
+por ID, de modo que las peticiones HTTP responden enseguida aunque la
+generación tarde minutos.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+# Estados de un trabajo
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETE = "complete"
+FAILED = "failed"
+
+
+class JobQueueFull(Exception):
+    """No caben más trabajos pendientes en la cola."""
+
+
+class Job:
+    """Estado de un trabajo. ``progress`` y ``result`` los actualiza el propio trabajo."""
+
+    def __init__(self) -> None:
+        self.id = uuid.uuid4().hex
+        self.status = QUEUED
+        self.progress = ""
+        self.result: List[Dict[str, Any]] = []
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+
+    def update(self, progress: Optional[str] = None, result: Optional[List[Dict[str, Any]]] = None) -> None:
+        if progress is not None:
+            self.progress = progress
+        if result is not None:
+            self.result = result
+        self.updated_at = time.time()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (COMPLETE, FAILED)
+
+
+class JobManager:
+    """Ejecuta trabajos en un pool acotado y guarda su estado durante ``ttl`` segundos."""
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 100, ttl: float = 3600) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="suno-job")
+        self._max_pending = max_pending
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Job] = {}
+
+    def submit(self, fn: Callable[[Job], None]) -> Job:
+        """Encola ``fn(job)`` y devuelve el trabajo sin esperar a que termine.
+
+        Raises:
+            JobQueueFull: Si ya hay ``max_pending`` trabajos sin terminar
+        """
+        with self._lock:
+            self._purge()
+            pending = sum(1 for job in self._jobs.values() if not job.finished)
+            if pending >= self._max_pending:
+                raise JobQueueFull(f"Too many pending jobs ({pending})")
+            job = Job()
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, fn)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job: Job, fn: Callable[[Job], None]) -> None:
+        job.status = RUNNING
+        job.update()
+        try:
+            fn(job)
+            job.status = COMPLETE
+        except Exception as e:
+            print(f"Error en el trabajo {job.id}: {e}")
+            job.error = str(e)
+            job.status = FAILED
+        job.update()
+
+    def _purge(self) -> None:
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished and now - job.updated_at > self._ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,383 @@
+"""Coordinador de sondeo compartido para el feed de Suno.
+
+Todas las esperas activas de una cuenta se registran en un único
+``FeedPoller``, que consulta los clips pendientes con una sola petición
+``/feed/?ids=a,b,c`` por ciclo y despierta a cada espera cuando su clip
+cumple la condición pedida. Así la carga de sondeo crece con los ciclos y
+no con el número de clips.
+"""
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .suno_client import Song, Suno
+
+# Máximo de IDs por petición al feed, para no generar URLs demasiado largas
+MAX_IDS_PER_REQUEST = 50
+DEFAULT_POLL_INTERVAL = 2.0
+# Condición de las esperas que no indican qué esperan
+DEFAULT_CONDITION = "custom"
+
+_callbacks_lock = threading.Lock()
+
+
+class FeedWatch:
+    """Espera registrada en el coordinador para un clip concreto."""
+
+    def __init__(
+        self,
+        song_id: str,
+        on_update: Callable[["Song"], bool],
+        deadline: Optional[float] = None,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        condition: str = DEFAULT_CONDITION,
+    ) -> None:
+        self.song_id = song_id
+        self.on_update = on_update
+        self.deadline = deadline
+        self.interval = interval
+        # Qué se espera del clip ("audio", "video", "status"...): cada condición tarda distinto
+        self.condition = condition
+        self.song: Optional["Song"] = None
+        self.error: Optional[BaseException] = None
+        self.started = time.monotonic()
+        self.next_poll_at = self.started
+        self.polls = 0
+        self._done = threading.Event()
+        self._callbacks: List[Callable[["FeedWatch"], None]] = []
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def add_done_callback(self, fn: Callable[["FeedWatch"], None]) -> None:
+        """Llama a ``fn(watch)`` al terminar la espera (desde el hilo de sondeo)."""
+        with _callbacks_lock:
+            if not self._done.is_set():
+                self._callbacks.append(fn)
+                return
+        fn(self)
+
+    def _finish(self, song: Optional["Song"] = None, error: Optional[BaseException] = None) -> None:
+        with _callbacks_lock:
+            self.song = song
+            self.error = error
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            try:
+                fn(self)
+            except Exception as e:
+                print(f"Error en callback de espera para {self.song_id}: {e}")
+
+    def result(self, timeout: Optional[float] = None) -> "Song":
+        """Bloquea hasta que la espera termina y devuelve el último Song recibido."""
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"Tiempo de espera agotado para la canción {self.song_id}")
+        if self.error is not None:
+            raise self.error
+        return self.song
+
+
+# ===================== ESTRATEGIAS DE SONDEO ===================== #
+class PollStrategy:
+    """Decide cuándo volver a consultar un clip.
+
+    La estrategia base respeta el intervalo fijo pedido por cada espera.
+    """
+
+    def next_delay(self, watch: FeedWatch, song: Optional["Song"]) -> float:
+        """Segundos hasta la próxima consulta del clip de ``watch``."""
+        return watch.interval
+
+    def observe_ready(self, watch: FeedWatch, song: "Song") -> None:
+        """Se llama cuando una espera se cumple, para que la estrategia aprenda."""
+
+
+class AdaptivePollStrategy(PollStrategy):
+    """Sondeo según el estado del clip y el tiempo de generación aprendido por modelo.
+
+    - Los estados iniciales (``submitted``, ``queued``) se consultan con menos
+      frecuencia que ``streaming``.
+    - Con una estimación del tiempo hasta que el clip está listo para su
+      modelo y la condición esperada (audio, vídeo, estado final...), se
+      espacian las consultas mientras falta mucho y se aprietan al acercarse
+      a la hora prevista. Pasada esa hora se vuelve al ritmo según el estado.
+    - Se añade jitter para que las esperas simultáneas no se sincronicen.
+    """
+
+    STATUS_FACTORS = {
+        "submitted": 3.0,
+        "queued": 2.0,
+        "streaming": 1.0,
+    }
+
+    def __init__(
+        self,
+        min_delay: float = 0.5,
+        max_delay: float = 15.0,
+        jitter: float = 0.1,
+        smoothing: float = 0.3,
+    ) -> None:
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        # Segundos estimados desde la creación del clip hasta que está listo, por modelo y condición
+        self._expected: Dict[Tuple[str, str], float] = {}
+
+    def expected_ready_time(self, model: str, condition: str = DEFAULT_CONDITION) -> Optional[float]:
+        return self._expected.get((model, condition))
+
+    def next_delay(self, watch: FeedWatch, song: Optional["Song"]) -> float:
+        if song is None:
+            return watch.interval
+        delay = watch.interval * self.STATUS_FACTORS.get(song.status, 1.0)
+
+        expected = self._expected.get((song.model_name, watch.condition))
+        if expected is not None:
+            remaining = expected - _clip_age(watch, song)
+            # Con el clip ya retrasado (remaining < 0) manda el ritmo según su estado
+            if 0 <= remaining <= watch.interval:
+                # Cerca de la hora prevista: consultar más a menudo
+                delay = min(delay, watch.interval / 2)
+            elif remaining > watch.interval:
+                # Lejos de la hora prevista: no consultar antes de la mitad del tiempo restante
+                delay = max(delay, remaining / 2)
+
+        delay = min(max(delay, self.min_delay), self.max_delay)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def observe_ready(self, watch: FeedWatch, song: "Song") -> None:
+        # Solo se aprende de esperas que vieron el clip sin terminar; si ya estaba
+        # listo en la primera consulta no sabemos cuándo lo estuvo
+        if watch.polls < 2:
+            return
+        age = _clip_age(watch, song)
+        key = (song.model_name, watch.condition)
+        with self._lock:
+            previous = self._expected.get(key)
+            self._expected[key] = age if previous is None else (
+                previous + self.smoothing * (age - previous)
+            )
+
+
+def _clip_age(watch: FeedWatch, song: "Song") -> float:
+    """Segundos desde la creación del clip, o desde el inicio de la espera si no se sabe."""
+    try:
+        created = datetime.fromisoformat(song.created_at.replace("Z", "+00:00"))
+        if created.tzinfo is None:
+            created = created.replace(tzinfo=timezone.utc)
+        return max((datetime.now(timezone.utc) - created).total_seconds(), 0.0)
+    except (AttributeError, TypeError, ValueError):
+        return time.monotonic() - watch.started
+
+
+# Compartida por todas las cuentas para que lo aprendido sirva a todo el proceso
+DEFAULT_STRATEGY = AdaptivePollStrategy()
+
+
+class FeedPoller:
+    """Consulta en lote el estado de los clips registrados por una cuenta.
+
+    El hilo de sondeo se arranca con la primera espera y termina solo cuando
+    no quedan esperas pendientes. En cada ciclo se consultan juntos todos los
+    clips cuya próxima consulta, fijada por la ``PollStrategy``, ya ha vencido.
+    """
+
+    def __init__(
+        self,
+        client: "Suno",
+        batch_size: int = MAX_IDS_PER_REQUEST,
+        strategy: Optional[PollStrategy] = None,
+    ) -> None:
+        self._client = client
+        self._batch_size = batch_size
+        self.strategy = strategy or DEFAULT_STRATEGY
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._watches: Dict[str, List[FeedWatch]] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(
+        self,
+        song_id: str,
+        on_update: Callable[["Song"], bool],
+        timeout: Optional[float] = None,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        condition: str = DEFAULT_CONDITION,
+    ) -> FeedWatch:
+        """Registra una espera sobre ``song_id``.
+
+        ``on_update`` recibe cada versión nueva del clip y devuelve True cuando
+        la espera está satisfecha; ``condition`` nombra lo que se espera para
+        que la estrategia aprenda su tiempo por separado.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        watch = FeedWatch(song_id, on_update, deadline, interval, condition)
+        with self._lock:
+            self._watches.setdefault(song_id, []).append(watch)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="suno-feed-poller", daemon=True)
+                self._thread.start()
+        # Consultar enseguida: las esperas nuevas no deben aguardar un ciclo completo
+        self._wakeup.set()
+        return watch
+
+    def wait(
+        self,
+        song_id: str,
+        on_update: Callable[["Song"], bool],
+        timeout: Optional[float] = None,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        condition: str = DEFAULT_CONDITION,
+    ) -> "Song":
+        """Registra una espera y bloquea hasta que se cumple o expira."""
+        return self.watch(song_id, on_update, timeout, interval, condition).result()
+
+    def cancel(self, watch: FeedWatch) -> None:
+        """Retira una espera sin resolverla."""
+        with self._lock:
+            self._remove(watch)
+
+    def _remove(self, watch: FeedWatch) -> None:
+        watches = self._watches.get(watch.song_id)
+        if watches and watch in watches:
+            watches.remove(watch)
+            if not watches:
+                del self._watches[watch.song_id]
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            with self._lock:
+                self._expire()
+                if not self._watches:
+                    self._thread = None
+                    return
+                now = time.monotonic()
+                ids = [
+                    song_id for song_id, watches in self._watches.items()
+                    if any(w.next_poll_at <= now for w in watches)
+                ]
+
+            for start in range(0, len(ids), self._batch_size):
+                self._poll(ids[start:start + self._batch_size])
+
+            with self._lock:
+                pending = [w for ws in self._watches.values() for w in ws]
+            if pending:
+                next_at = min(min(w.next_poll_at for w in pending), min(
+                    (w.deadline for w in pending if w.deadline is not None), default=float("inf")
+                ))
+                self._wakeup.wait(max(next_at - time.monotonic(), 0))
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for watches in list(self._watches.values()):
+            for watch in list(watches):
+                if watch.deadline is not None and now >= watch.deadline:
+                    self._remove(watch)
+                    watch._finish(watch.song, TimeoutError(
+                        f"Tiempo de espera agotado para la canción {watch.song_id}"
+                    ))
+
+    def _is_retryable(self, error: Exception) -> bool:
+        """Si un fallo del feed es transitorio según la política de reintentos del cliente."""
+        from .suno_client import SunoRequestError
+
+        policy = self._client._client.retry_policy
+        if isinstance(error, SunoRequestError):
+            if error.status_code is not None:
+                return policy.is_retryable_status(error.status_code)
+            return error.__cause__ is None or policy.is_retryable_error(error.__cause__)
+        return policy.is_retryable_error(error)
+
+    def _poll(self, ids: List[str]) -> None:
+        try:
+            songs = self._client.get_songs_by_ids(ids)
+        except Exception as e:
+            print(f"Error consultando el feed para {len(ids)} clips: {e}")
+            with self._lock:
+                if self._is_retryable(e):
+                    # Cada espera sigue intentándolo hasta su propio deadline
+                    for song_id in ids:
+                        for watch in self._watches.get(song_id, []):
+                            watch.next_poll_at = time.monotonic() + watch.interval
+                    return
+                for song_id in ids:
+                    for watch in self._watches.pop(song_id, []):
+                        watch._finish(error=e)
+            return
+
+        for song in songs:
+            with self._lock:
+                watches = list(self._watches.get(song.id, []))
+            for watch in watches:
+                watch.song = song
+                watch.polls += 1
+                try:
+                    satisfied = watch.on_update(song)
+                except Exception as e:
+                    with self._lock:
+                        self._remove(watch)
+                    watch._finish(song, e)
+                    continue
+                if satisfied:
+                    with self._lock:
+                        self._remove(watch)
+                    self.strategy.observe_ready(watch, song)
+                    watch._finish(song)
+                elif song.status == "error":
+                    with self._lock:
+                        self._remove(watch)
+                    watch._finish(song, Exception(f"La generación de la canción {song.id} falló"))
+                else:
+                    watch.next_poll_at = time.monotonic() + self.strategy.next_delay(watch, song)
+
+        # Clips que el feed no devolvió: reintentar en su intervalo normal
+        returned = {song.id for song in songs}
+        with self._lock:
+            for song_id in ids:
+                if song_id not in returned:
+                    for watch in self._watches.get(song_id, []):
+                        watch.next_poll_at = time.monotonic() + watch.interval
+
+
+# ===================== REGISTRO POR CUENTA ===================== #
+_pollers: Dict[str, FeedPoller] = {}
+_pollers_lock = threading.Lock()
+
+
+def get_poller(client: "Suno") -> FeedPoller:
+    """Devuelve el coordinador compartido de la cuenta a la que pertenece ``client``."""
+    key = client._client.fingerprint
+    with _pollers_lock:
+        poller = _pollers.get(key)
+        if poller is None:
+            poller = _pollers[key] = FeedPoller(client)
+        else:
+            # El cliente anterior puede haberse cerrado; usar siempre el más reciente
+            poller._client = client
+        return poller
+
+
+def wrap_watch(watch: FeedWatch) -> "asyncio.Future[Song]":
+    """Adapta una espera a un ``asyncio.Future`` del event loop actual, sin ocupar hilos."""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def resolve(w: FeedWatch) -> None:
+        if future.done():
+            return
+        if w.error is not None:
+            future.set_exception(w.error)
+        else:
+            future.set_result(w.song)
+
+    watch.add_done_callback(lambda w: loop.call_soon_threadsafe(resolve, w))
+    return future
@@ -0,0 +1,85 @@
+"""Limitación de peticiones por cuenta.
+
+Cada cuenta tiene un token bucket compartido por todos los hilos y clientes
+del proceso. Las peticiones se reparten a ritmo constante en lugar de salir
+todas a la vez, y cuando Suno responde 429 con ``Retry-After`` toda la cuenta
+se pausa durante ese tiempo.
+"""
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+# Peticiones por segundo permitidas por cuenta (0 desactiva el límite)
+DEFAULT_RATE = float(os.getenv("SUNO_RATE_LIMIT", "2"))
+# Peticiones que pueden salir seguidas tras un periodo sin tráfico
+DEFAULT_BURST = float(os.getenv("SUNO_RATE_BURST", "5"))
+
+
+class TokenBucket:
+    """Token bucket seguro entre hilos con soporte de pausas explícitas (``Retry-After``)."""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: float = DEFAULT_BURST) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Reserva un token y devuelve los segundos que hay que esperar antes de usarlo.
+
+        No bloquea, así que sirve tanto para ``time.sleep`` como para ``asyncio.sleep``.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(self._blocked_until - now, 0.0)
+            if self.rate <= 0:
+                return wait
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens < 0:
+                wait = max(wait, -self._tokens / self.rate)
+            return wait
+
+    def acquire(self) -> None:
+        """Bloquea hasta que la petición puede salir."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Detiene todas las peticiones de la cuenta durante ``seconds``."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Interpreta una cabecera ``Retry-After`` (segundos o fecha HTTP)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(fingerprint: str) -> TokenBucket:
+    """Devuelve el limitador compartido de la cuenta con esa huella de cookie."""
+    with _limiters_lock:
+        limiter = _limiters.get(fingerprint)
+        if limiter is None:
+            limiter = _limiters[fingerprint] = TokenBucket()
+        return limiter
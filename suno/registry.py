@@ -0,0 +1,99 @@
+"""Registro de clientes Suno compartidos por todo el proceso.
+
+Los nodos de ComfyUI y el proxy piden su cliente aquí en lugar de crear un
+``Suno`` nuevo en cada ejecución, de modo que las ejecuciones repetidas con
+la misma cookie reutilizan la sesión HTTP y el estado de autenticación.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from .suno_client import COOKIE, Suno, _cookie_fingerprint
+
+# Número máximo de cuentas con cliente abierto a la vez, sin contar los fijados
+DEFAULT_MAX_CLIENTS = int(os.getenv("SUNO_CLIENT_CACHE_SIZE", "8"))
+# Segundos sin uso tras los que se cierra un cliente
+DEFAULT_IDLE_TTL = float(os.getenv("SUNO_CLIENT_IDLE_TTL", "1800"))
+
+
+class _Entry:
+    def __init__(self, client: Suno) -> None:
+        self.client = client
+        self.last_used = time.monotonic()
+        # Cuentas de un pool que guardan este cliente; mientras haya alguna no se expulsa
+        self.pins = 0
+
+
+class ClientRegistry:
+    """Clientes Suno indexados por la huella de su cookie, con expulsión LRU y por inactividad.
+
+    Los clientes fijados (``pin=True``) no se expulsan: los guardan las cuentas
+    de ``AccountPool``, que pueden ser más que ``max_clients``.
+    """
+
+    def __init__(self, max_clients: int = DEFAULT_MAX_CLIENTS, idle_ttl: float = DEFAULT_IDLE_TTL) -> None:
+        self._max_clients = max_clients
+        self._idle_ttl = idle_ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+
+    def get(self, cookie: Optional[str] = None, pin: bool = False) -> Suno:
+        """Devuelve el cliente de la cuenta, creándolo si aún no existe.
+
+        Con ``pin=True`` el cliente queda fijado y ya no se cierra por LRU ni por inactividad.
+        """
+        cookie = cookie or COOKIE
+        if not cookie:
+            raise Exception("environment variable SUNO_COOKIE is not set")
+        key = _cookie_fingerprint(cookie)
+        evicted = []
+        with self._lock:
+            evicted.extend(self._pop_idle())
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(Suno(cookie=cookie))
+                unpinned = [old for old, item in self._entries.items() if not item.pins and old != key]
+                for old in unpinned[:max(len(unpinned) + 1 - self._max_clients, 0)]:
+                    evicted.append(self._entries.pop(old))
+            else:
+                entry.last_used = time.monotonic()
+                self._entries.move_to_end(key)
+            if pin:
+                entry.pins += 1
+            client = entry.client
+
+        for old in evicted:
+            self._close(old)
+        return client
+
+    def _pop_idle(self):
+        now = time.monotonic()
+        idle = [key for key, entry in self._entries.items() if not entry.pins and now - entry.last_used > self._idle_ttl]
+        return [self._entries.pop(key) for key in idle]
+
+    def _close(self, entry: _Entry) -> None:
+        try:
+            entry.client.close()
+        except Exception as e:
+            print(f"Error cerrando cliente Suno: {e}")
+
+    def close_all(self) -> None:
+        """Cierra todos los clientes abiertos."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            self._close(entry)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_registry = ClientRegistry()
+
+
+def get_client(cookie: Optional[str] = None, pin: bool = False) -> Suno:
+    """Devuelve el cliente Suno compartido para ``cookie``."""
+    return _registry.get(cookie, pin)
@@ -0,0 +1,45 @@
+"""Codificación JSON compartida por los nodos y el proxy.
+
+Usa ``orjson`` si está instalado (``pip install orjson``), que codifica
+varias veces más rápido y produce bytes directamente, y el módulo ``json``
+de la biblioteca estándar si no. La salida es compacta salvo que se pida
+indentación, y los modelos pydantic se codifican por sus campos, nunca por
+su ``__dict__`` interno.
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Tipos que ni orjson ni json codifican por sí mismos."""
+    if hasattr(obj, "dict") and hasattr(obj, "__fields__"):
+        return obj.dict()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    """Codifica ``obj`` como JSON UTF-8; con ``indent`` usa dos espacios por nivel."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, default=_default, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """Como ``dumps_bytes``, pero devuelve ``str``."""
+    return dumps_bytes(obj, indent).decode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Decodifica JSON desde ``str`` o ``bytes``."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
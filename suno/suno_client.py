@@ -1,17 +1,26 @@
 import os
+import base64
+import hashlib
 import json
 import pathlib
 import random
 import re
+import threading
 import time
-from typing import List, Optional, Union, Dict, Any
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, ClassVar, Iterator, List, Optional, Union, Dict, Any
 from curl_cffi import requests
 from curl_cffi.requests import Response
 from pydantic import BaseModel, ConfigDict
 
+from .config import AVAILABLE_MODELS
+from .http_pool import AccountCookies, get_session_pool
+from .poller import FeedWatch, get_poller
+from .ratelimit import get_rate_limiter, retry_after_seconds
+
 import asyncio
 #from pyppeteer import launch
-from typing import Optional
 
 # ===================== CONFIGURACIÓN ===================== #
 COOKIE = os.getenv("SUNO_COOKIE", "")
@@ -32,30 +41,44 @@ URL_CREDITS = f"{BASE_URL}/billing/info"
 URL_EXTEND = f"{BASE_URL}/user/extend_session_id/"
 URL_VERIFY = f"{CLERK_URL}/client/verify?__clerk_api_version={CLERK_API_VERSION}&_clerk_js_version={CLIENT_JS_VERSION}"
 
-
-# Available models with their descriptions
-AVAILABLE_MODELS = {
-    "chirp-v4": "Last generation model",
-    "chirp-v3-5": "Default high-quality model",
-    "chirp-v3-0": "Previous generation model",
-    "chirp-v2-5": "Earlier generation model",
-    # Add more models as they become available
+# Cabeceras de navegador enviadas en todas las peticiones a Suno
+BROWSER_HEADERS = {
+    "Accept": "*/*",
+    "Dnt": "1",
+    "Priority": "u=1, i",
+    "Referer": "https://suno.com/",
+    "Sec-Ch-Ua": '"Chromium";v="124", "Google Chrome";v="124", "Not-A.Brand";v="99"',
+    "Sec-Ch-Ua-Mobile": "?0",
+    "Sec-Ch-Ua-Platform": '"macOS"',
+    "Sec-Fetch-Dest": "empty",
+    "Sec-Fetch-Mode": "cors",
+    "Sec-Fetch-Site": "same-site",
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
 }
 
+# Margen en segundos antes de la expiración del JWT en el que se renueva
+JWT_REFRESH_MARGIN = 10
+# Vida asumida para un JWT cuyo claim "exp" no se puede leer
+JWT_DEFAULT_TTL = 30
+# Segundos durante los que se reutiliza el saldo de créditos consultado
+CREDITS_TTL = float(os.getenv("SUNO_CREDITS_TTL", "30"))
+# Segundos durante los que se recuerda que la consulta del saldo ha fallado
+CREDITS_FAILURE_TTL = float(os.getenv("SUNO_CREDITS_FAILURE_TTL", "10"))
+# Créditos que consume cada generación (dos clips de 5 créditos)
+CREDITS_PER_GENERATION = 10
+# Generaciones simultáneas por defecto en generate_batch
+DEFAULT_BATCH_CONCURRENCY = int(os.getenv("SUNO_BATCH_CONCURRENCY", "4"))
+
+
 class SunoConfig:
-    # Available models with their descriptions
-    AVAILABLE_MODELS = {
-        "chirp-v4": "Last generation model",
-        "chirp-v3-5": "Default high-quality model",
-        "chirp-v3-0": "Previous generation model",
-        "chirp-v2-5": "Earlier generation model",
-        # Add more models as they become available
-    }
+    # La lista vive en config.py para que los nodos la lean sin cargar el cliente
+    AVAILABLE_MODELS = AVAILABLE_MODELS
 
 # ===================== MODELOS ===================== #
 class Song(BaseModel):
     """Modelo para representar canciones generadas por Suno."""
-    model_config = ConfigDict(protected_namespaces=())
+    # ClassVar: con pydantic v1 un ``model_config`` sin anotar se convierte en un campo más
+    model_config: ClassVar[ConfigDict] = ConfigDict(protected_namespaces=())
     id: str
     video_url: str
     audio_url: str
@@ -76,65 +99,352 @@ class Song(BaseModel):
     upvote_count: int
     is_public: bool
 
+class Credits(BaseModel):
+    """Saldo de créditos de una cuenta según ``/billing/info``."""
+    credits_left: int
+    period: Optional[str] = None
+    monthly_limit: Optional[int] = None
+    monthly_usage: Optional[int] = None
+
+class BatchResult:
+    """Resultado de un prompt de ``generate_batch``: sus canciones o el error que lo impidió."""
+    def __init__(self, prompt: str, songs: Optional[List[Song]] = None, error: Optional[Exception] = None) -> None:
+        self.prompt = prompt
+        self.songs = songs or []
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
 class SongGenerateParams(BaseModel):
     """Parámetros para generar canciones."""
-    model_config = ConfigDict(protected_namespaces=())
+    model_config: ClassVar[ConfigDict] = ConfigDict(protected_namespaces=())
     prompt: str
     custom: bool = False
     tags: str = ""
     instrumental: bool = False
 
 
+# ===================== CACHÉ DE AUTENTICACIÓN ===================== #
+def _cookie_fingerprint(cookie: str) -> str:
+    """Huella estable de una cookie, para indexar estado por cuenta sin guardarla en claro."""
+    return hashlib.sha256(cookie.encode("utf-8")).hexdigest()
+
+def _jwt_expiry(token: str) -> Optional[float]:
+    """Devuelve el claim ``exp`` de un JWT (epoch en segundos), o None si no se puede leer."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except Exception:
+        return None
+
+class TokenCache:
+    """SID y JWT de una cuenta, reutilizados hasta poco antes de caducar.
+
+    Todos los clientes creados con la misma cookie comparten la misma caché,
+    y cuando varios hilos la encuentran caducada solo uno de ellos renueva.
+    El SID y el JWT tienen locks distintos: obtener el JWT necesita el SID, y
+    con un único lock (no reentrante) el primer JWT de una cuenta se bloqueaba
+    esperando al SID.
+    """
+    def __init__(self, margin: float = JWT_REFRESH_MARGIN) -> None:
+        self._sid_lock = threading.Lock()
+        self._jwt_lock = threading.Lock()
+        self._margin = margin
+        self.sid: Optional[str] = None
+        self.jwt: Optional[str] = None
+        self._expires_at = 0.0
+
+    def _jwt_valid(self) -> bool:
+        return self.jwt is not None and time.time() < self._expires_at - self._margin
+
+    def valid_jwt(self) -> Optional[str]:
+        """JWT en caché si sigue vigente, o None si hay que renovarlo."""
+        return self.jwt if self._jwt_valid() else None
+
+    def get_sid(self, fetch: Callable[[], str]) -> str:
+        if self.sid:
+            return self.sid
+        with self._sid_lock:
+            if not self.sid:
+                self.sid = fetch()
+            return self.sid
+
+    def get_jwt(self, fetch: Callable[[], str]) -> str:
+        if self._jwt_valid():
+            return self.jwt
+        with self._jwt_lock:
+            if not self._jwt_valid():
+                self.store_jwt(fetch())
+            return self.jwt
+
+    def refresh_jwt(self, fetch: Callable[[], str], stale: Optional[str] = None) -> str:
+        """Fuerza la renovación del JWT, salvo que otro hilo ya haya sustituido ``stale``."""
+        with self._jwt_lock:
+            if stale is None or self.jwt == stale or not self._jwt_valid():
+                self.store_jwt(fetch())
+            return self.jwt
+
+    def store_jwt(self, jwt: str) -> None:
+        """Guarda un JWT recién obtenido junto con su expiración."""
+        self.jwt = jwt
+        self._expires_at = _jwt_expiry(jwt) or time.time() + JWT_DEFAULT_TTL
+
+    def invalidate(self, sid: Optional[str] = None) -> None:
+        """Olvida SID y JWT; con ``sid``, solo si sigue siendo el SID en caché."""
+        with self._sid_lock, self._jwt_lock:
+            if sid is not None and self.sid != sid:
+                # Otro hilo ya ha sustituido la sesión caducada
+                return
+            self.sid = None
+            self.jwt = None
+            self._expires_at = 0.0
+
+_token_caches: Dict[str, TokenCache] = {}
+_token_caches_lock = threading.Lock()
+
+def get_token_cache(fingerprint: str) -> TokenCache:
+    """Devuelve la caché de autenticación compartida para una cuenta."""
+    with _token_caches_lock:
+        cache = _token_caches.get(fingerprint)
+        if cache is None:
+            cache = _token_caches[fingerprint] = TokenCache()
+        return cache
+
+# ===================== CACHÉ DE CRÉDITOS ===================== #
+class InsufficientCreditsError(Exception):
+    """La cuenta no tiene créditos suficientes para generar."""
+    def __init__(self, credits_left: int, needed: int = CREDITS_PER_GENERATION) -> None:
+        super().__init__(f"Créditos insuficientes: quedan {credits_left}, se necesitan {needed}")
+        self.credits_left = credits_left
+        self.needed = needed
+
+class CreditsCache:
+    """Último saldo conocido de una cuenta, compartido por todos sus clientes.
+
+    Se consulta a Suno como mucho una vez cada ``ttl`` segundos; entre
+    consultas, cada generación aceptada descuenta su coste del saldo en caché.
+    Una consulta fallida también se recuerda durante ``failure_ttl`` segundos,
+    para no gastar el presupuesto de reintentos en cada generación.
+    """
+    def __init__(self, ttl: float = CREDITS_TTL, failure_ttl: float = CREDITS_FAILURE_TTL) -> None:
+        self._lock = threading.Lock()
+        # Las corrutinas no pueden esperar en ``_lock``: cada event loop tiene el suyo
+        self._async_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+        self._async_locks_lock = threading.Lock()
+        self._ttl = ttl
+        self._failure_ttl = failure_ttl
+        self.credits: Optional[Credits] = None
+        self._expires_at = 0.0
+        self._error: Optional[Exception] = None
+        self._failed_until = 0.0
+
+    def peek(self) -> Optional[Credits]:
+        """Saldo en caché si sigue vigente, sin consultar a Suno."""
+        return self.credits if time.monotonic() < self._expires_at else None
+
+    def get(self, fetch: Callable[[], Credits], refresh: bool = False) -> Credits:
+        credits = None if refresh else self.peek()
+        if credits is not None:
+            return credits
+        with self._lock:
+            credits = None if refresh else self.peek()
+            if credits is not None:
+                return credits
+            self._raise_recent_failure(refresh)
+            try:
+                credits = fetch()
+            except Exception as e:
+                self._remember_failure(e)
+                raise
+            self.store(credits)
+            return credits
+
+    async def get_async(self, fetch: Callable[[], Awaitable[Credits]], refresh: bool = False) -> Credits:
+        """Equivalente de ``get`` para corrutinas, con una sola consulta en vuelo por event loop."""
+        credits = None if refresh else self.peek()
+        if credits is not None:
+            return credits
+        loop = asyncio.get_running_loop()
+        with self._async_locks_lock:
+            lock = self._async_locks.setdefault(loop, asyncio.Lock())
+        async with lock:
+            credits = None if refresh else self.peek()
+            if credits is not None:
+                return credits
+            self._raise_recent_failure(refresh)
+            try:
+                credits = await fetch()
+            except Exception as e:
+                self._remember_failure(e)
+                raise
+            self.store(credits)
+            return credits
+
+    def _raise_recent_failure(self, refresh: bool) -> None:
+        if not refresh and self._error is not None and time.monotonic() < self._failed_until:
+            raise self._error
+
+    def _remember_failure(self, error: Exception) -> None:
+        self._error = error
+        self._failed_until = time.monotonic() + self._failure_ttl
+
+    def store(self, credits: Credits) -> None:
+        """Guarda un saldo recién consultado."""
+        self.credits = credits
+        self._expires_at = time.monotonic() + self._ttl
+        self._error = None
+
+    def spend(self, amount: int) -> None:
+        with self._lock:
+            if self.credits is not None:
+                self.credits = self.credits.copy(update={"credits_left": max(self.credits.credits_left - amount, 0)})
+
+_credits_caches: Dict[str, CreditsCache] = {}
+_credits_caches_lock = threading.Lock()
+
+def get_credits_cache(fingerprint: str) -> CreditsCache:
+    """Devuelve la caché de créditos compartida para una cuenta."""
+    with _credits_caches_lock:
+        cache = _credits_caches.get(fingerprint)
+        if cache is None:
+            cache = _credits_caches[fingerprint] = CreditsCache()
+        return cache
+
+# ===================== POLÍTICA DE REINTENTOS ===================== #
+class SunoRequestError(Exception):
+    """Fallo definitivo de una petición a Suno.
+
+    Conserva la última respuesta recibida (si la hubo) y el número de intentos;
+    el error de red original queda encadenado en ``__cause__``.
+    """
+    def __init__(self, message: str, response: Optional[Response] = None, attempts: int = 0) -> None:
+        super().__init__(message)
+        self.response = response
+        self.attempts = attempts
+
+    @property
+    def status_code(self) -> Optional[int]:
+        return self.response.status_code if self.response is not None else None
+
+class RetryPolicy:
+    """Decide qué fallos se reintentan y cuánto se espera entre intentos.
+
+    Solo se reintentan los errores de red y los estados transitorios; el resto
+    de respuestas 4xx fallan a la primera. Las esperas usan "decorrelated
+    jitter" y ningún intento empieza si ya no cabe en el presupuesto total.
+    """
+    RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 10.0,
+        budget: float = 30.0,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        return status_code in self.RETRYABLE_STATUSES
+
+    def is_retryable_error(self, error: Exception) -> bool:
+        """Los errores de transporte (conexión, timeout, TLS) son transitorios."""
+        return isinstance(error, (requests.RequestsError, OSError))
+
+    def next_delay(self, previous: float) -> float:
+        return min(self.max_delay, random.uniform(self.base_delay, max(previous, self.base_delay) * 3))
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
 # ===================== CLIENTE BASE CON CLOUDFLARE BYPASS ===================== #
 class CloudflareBypassClient:
     """Cliente base con manejo de desafíos Cloudflare."""
-    def __init__(self, cookie: str, proxies: Optional[Dict[str, str]] = None) -> None:
-        self.headers = {
-            "Accept": "*/*",
-            "Dnt": "1",
-            "Priority": "u=1, i",
-            "Referer": "https://suno.com/",
-            "Sec-Ch-Ua": '"Chromium";v="124", "Google Chrome";v="124", "Not-A.Brand";v="99"',
-            "Sec-Ch-Ua-Mobile": "?0",
-            "Sec-Ch-Ua-Platform": '"macOS"',
-            "Sec-Fetch-Dest": "empty",
-            "Sec-Fetch-Mode": "cors",
-            "Sec-Fetch-Site": "same-site",
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
-            "cookie": cookie
-        }
-        self._session = requests.Session(
-            headers=self.headers,
-            proxies=proxies,
-            impersonate="chrome110",
-            timeout=30
-        )
-        self._max_retries = 5
-        self._retry_delay = 3
-        self._sid = None
-        self._jwt = None
+    def __init__(
+        self,
+        cookie: str,
+        proxies: Optional[Dict[str, str]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ) -> None:
+        self.headers = {**BROWSER_HEADERS, "cookie": cookie}
+        # Las conexiones se comparten con el resto de clientes; las cookies
+        # que devuelve Suno se guardan aparte para cada cuenta
+        self._pool = get_session_pool()
+        self._session = self._pool.session(proxies)
+        self.cookies = AccountCookies(cookie)
+        self.retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+        self.fingerprint = _cookie_fingerprint(cookie)
+        self._tokens = get_token_cache(self.fingerprint)
+        self._limiter = get_rate_limiter(self.fingerprint)
+
+    @property
+    def _sid(self) -> Optional[str]:
+        return self._tokens.sid
+
+    @_sid.setter
+    def _sid(self, sid: Optional[str]) -> None:
+        self._tokens.sid = sid
+
+    @property
+    def _jwt(self) -> Optional[str]:
+        return self._tokens.jwt
+
+    def _fetch_sid(self) -> str:
+        response = self.request("GET", URL_SID, renew_auth=False)
+        response.raise_for_status()
+        sid = response.json()["response"]["last_active_session_id"]
+        print(f"SID: {sid}")
+        return sid
 
-    def _get_sid(self) -> str:
-        response = self.request("GET", URL_SID)
+    def _fetch_jwt(self, sid: str) -> str:
+        url = URL_JWT.format(sid=sid)
+        response = self.request("POST", url, renew_auth=False)
         response.raise_for_status()
-        self._sid = response.json()["response"]["last_active_session_id"]
-        return self._sid
+        jwt = response.json().get("jwt")
+        print(f"JWT obtenido: {jwt[:20]}...")
+        return jwt
+
+    def _get_sid(self) -> str:
+        return self._tokens.get_sid(self._fetch_sid)
+
+    def _with_session(self, use: Callable[[str], str]) -> str:
+        """Llama a ``use(sid)``; si Clerk ya no reconoce la sesión (401/404), repite con un SID nuevo.
+
+        El SID se resuelve antes de entrar en el lock del JWT.
+        """
+        sid = self._get_sid()
+        try:
+            return use(sid)
+        except SunoRequestError as e:
+            if e.status_code not in (401, 404):
+                raise
+            print(f"La sesión {sid} ya no es válida ({e.status_code}). Obteniendo un SID nuevo...")
+            self._tokens.invalidate(sid)
+            return use(self._get_sid())
 
     def _get_jwt(self) -> str:
-        if not self._sid:
-            self._get_sid()
-        url = URL_JWT.format(sid=self._sid)
-        response = self.request("POST", url)
-        response.raise_for_status()
-        self._jwt = response.json().get("jwt")
-        print(f"JWT obtenido: {self._jwt[:20]}...")
-        return self._jwt
+        if self._tokens.valid_jwt():
+            return self._tokens.jwt
+        return self._with_session(lambda sid: self._tokens.get_jwt(lambda: self._fetch_jwt(sid)))
 
     def _renew(self) -> None:
         """Renueva el JWT y actualiza los headers de autorización."""
         try:
-            jwt = self._get_jwt()
-            self._session.headers["Authorization"] = f"Bearer {jwt}"
+            stale = self.headers.get("Authorization", "").replace("Bearer ", "")
+            cached = self._tokens.valid_jwt()
+            if not stale and cached:
+                # Cliente nuevo sin Authorization: basta con el JWT vigente de la cuenta
+                self.headers["Authorization"] = f"Bearer {cached}"
+                return
+            jwt = self._with_session(
+                lambda sid: self._tokens.refresh_jwt(lambda: self._fetch_jwt(sid), stale or None)
+            )
+            self.headers["Authorization"] = f"Bearer {jwt}"
             print("Token JWT renovado y headers actualizados")
         except Exception as e:
             print(f"Error al renovar JWT: {e}")
@@ -170,12 +480,8 @@ class CloudflareBypassClient:
         except Exception as e:
             print(f"Error al actualizar la sesión: {e}")
 
-    def _handle_cloudflare(self, response: Response) -> bool:
-        if response.status_code in (403, 503) and "cf-" in response.headers:
-            print("Detectado desafío Cloudflare. Intentando bypass...")
-            time.sleep(random.uniform(5, 8))
-            return True
-        return False
+    def _is_cloudflare_challenge(self, response: Response) -> bool:
+        return response.status_code in (403, 503) and "cf-" in response.headers
 
     async def _solve_hcaptcha(self) -> Optional[str]:
         """Resuelve el hCaptcha usando Puppeteer."""
@@ -230,7 +536,7 @@ class CloudflareBypassClient:
                 'referer': 'https://suno.com/'
             }
             
-            response = self._session.request(
+            response = self._send(
                 "POST",
                 URL_VERIFY,
                 data=payload,
@@ -266,40 +572,103 @@ class CloudflareBypassClient:
         else:
             return loop.run_until_complete(coro)
 
-    def request(self, method: str, url: str, **kwargs: Any) -> Response:
-        retries = 0
-        while retries < self._max_retries:
+    def _send(self, method: str, url: str, **kwargs: Any) -> Response:
+        """Envía una petición por la sesión compartida con las cabeceras y cookies de esta cuenta."""
+        kwargs["headers"] = {**self.headers, **(kwargs.get("headers") or {}), "cookie": self.cookies.header()}
+        with self._pool.host_slot(url):
+            response = self._session.request(method, url, **kwargs)
+        self.cookies.update(response)
+        return response
+
+    def request(self, method: str, url: str, renew_auth: bool = True, **kwargs: Any) -> Response:
+        """Envía una petición aplicando el limitador de la cuenta y la política de reintentos.
+
+        Args:
+            renew_auth: Si un 401 debe renovar el JWT antes de reintentar; las
+                peticiones que obtienen el propio JWT lo desactivan
+
+        Raises:
+            SunoRequestError: Si el fallo no es reintentable o se agotan los
+                intentos o el presupuesto de tiempo
+        """
+        policy = self.retry_policy
+        deadline = time.monotonic() + policy.budget
+        delay = policy.base_delay
+        response: Optional[Response] = None
+        error: Optional[Exception] = None
+        attempt = 0
+
+        while attempt < policy.max_attempts:
+            wait = self._limiter.reserve()
+            if time.monotonic() + wait >= deadline:
+                # La cuenta está en pausa (Retry-After) más allá del presupuesto
+                raise SunoRequestError(
+                    f"La cuenta está en pausa {wait:.1f}s, más de lo que queda del presupuesto de reintentos ({policy.budget:g}s)",
+                    response, attempt,
+                ) from error
+            if wait > 0:
+                time.sleep(wait)
+            attempt += 1
+            throttled = False
+            kwargs["impersonate"] = "chrome110"
             try:
-                kwargs["impersonate"] = "chrome110"
-                response = self._session.request(method, url, **kwargs)
-                
-                if response.status_code == 200:
+                response = self._send(method, url, **kwargs)
+                error = None
+            except Exception as e:
+                print(f"Error en la solicitud ({attempt}/{policy.max_attempts}): {e}")
+                error = e
+                if not policy.is_retryable_error(e):
+                    raise SunoRequestError(f"Error no recuperable en {method} {url}: {e}", attempts=attempt) from e
+                if "SSL" in str(e):
+                    kwargs["verify"] = False
+            else:
+                status = response.status_code
+                if status < 400:
                     return response
-                elif response.status_code == 401:
-                    print(f"Error de autenticación (401). Reintentando... ({retries + 1}/{self._max_retries})")
+                elif status == 401 and renew_auth:
+                    print(f"Error de autenticación (401). Reintentando... ({attempt}/{policy.max_attempts})")
                     self._renew()
-                elif response.status_code == 422:
+                elif status == 422:
                     print("Error 422: Captcha requerido")
                     # Aquí podrías implementar la obtención del token de captcha
-                    # Por ahora, solo manejamos el error
                     print("No se puede resolver el captcha automáticamente")
-                    raise Exception("Se requiere captcha")
-                elif self._handle_cloudflare(response):
-                    print(f"Reintentando después del desafío Cloudflare... ({retries + 1}/{self._max_retries})")
+                    raise SunoRequestError("Se requiere captcha", response, attempt)
+                elif status == 429:
+                    # El limitador pausa toda la cuenta, no solo esta petición
+                    pause = retry_after_seconds(response.headers.get("Retry-After")) or policy.next_delay(delay)
+                    print(f"Límite de peticiones alcanzado (429). Pausando la cuenta {pause:.1f}s ({attempt}/{policy.max_attempts})")
+                    self._limiter.pause(pause)
+                    throttled = True
+                elif self._is_cloudflare_challenge(response):
+                    pause = random.uniform(5, 8)
+                    if time.monotonic() + pause >= deadline:
+                        raise SunoRequestError(
+                            f"Desafío Cloudflare en {method} {url}: la espera de {pause:.1f}s no cabe en el presupuesto de reintentos",
+                            response, attempt,
+                        )
+                    print(f"Detectado desafío Cloudflare. Reintentando en {pause:.1f}s... ({attempt}/{policy.max_attempts})")
+                    time.sleep(pause)
+                elif not policy.is_retryable_status(status):
+                    raise SunoRequestError(f"{method} {url} falló con {status}: {response.text[:200]}", response, attempt)
                 else:
-                    response.raise_for_status()
-                
-            except Exception as e:
-                print(f"Error en la solicitud: {e}")
-                if "SSL" in str(e):
-                    kwargs["verify"] = False
-                
-            retries += 1
-            if retries < self._max_retries:
-                sleep_time = self._retry_delay * (2 ** retries)
-                time.sleep(sleep_time)
-        
-        raise Exception(f"No se pudo completar la solicitud después de {self._max_retries} intentos")
+                    print(f"Error {status} transitorio en {method} {url} ({attempt}/{policy.max_attempts})")
+
+            delay = policy.next_delay(delay)
+            # Tras un 429 la pausa se comprueba contra el presupuesto al reservar el siguiente turno
+            if time.monotonic() + (0 if throttled else delay) >= deadline:
+                print(f"Presupuesto de reintentos agotado ({policy.budget:g}s)")
+                break
+            if attempt < policy.max_attempts and not throttled:
+                time.sleep(delay)
+
+        raise SunoRequestError(
+            f"No se pudo completar la solicitud después de {attempt} intentos",
+            response, attempt,
+        ) from error
+
+    def close(self) -> None:
+        """Descarta las cookies de la cuenta; las conexiones pertenecen al pool compartido."""
+        self.cookies.clear()
 
     def __del__(self):
         """Cleanup cuando se destruye el objeto."""
@@ -322,8 +691,7 @@ class CloudflareBypassClient:
                 "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
             ]
             self.headers["User-Agent"] = random.choice(user_agents)
-            self._session.headers.update(self.headers)
-            self._session.cookies.clear()
+            self.cookies.clear()
             self._renew()  # Renovamos el JWT después de actualizar los headers
             print("Sesión actualizada con nuevos headers y JWT")
         except Exception as e:
@@ -337,45 +705,94 @@ class Suno:
         if not cookie:
             raise Exception("environment variable SUNO_COOKIE is not set")
         self._client = CloudflareBypassClient(cookie)
-        self._sid = self._get_sid()
-        print(f"SID: {self._sid}")
         self.songs = Songs(self)
 
+    @property
+    def _sid(self) -> str:
+        return self._get_sid()
+
     def _get_sid(self) -> str:
-        response = self._client.request("GET", URL_SID)
-        response.raise_for_status()
-        return response.json()["response"]["last_active_session_id"]
+        """SID de la sesión activa, obtenido una sola vez por cuenta."""
+        return self._client._get_sid()
 
     def _get_jwt(self) -> str:
-        url = URL_JWT.format(sid=self._sid)
-        response = self._client.request("POST", url)
-        response.raise_for_status()
-        jwt = response.json().get("jwt")
-        print(f"jwt: {jwt}")
-        return jwt
+        """JWT vigente de la cuenta; solo se pide a Clerk cuando está a punto de caducar."""
+        return self._client._get_jwt()
 
     def request(self, *args: Any, **kwargs: Any) -> Response:
         return self._client.request(*args, **kwargs)
 
+    def close(self) -> None:
+        self._client.close()
+
+    def _fetch_credits(self) -> Credits:
+        response = self.request("GET", URL_CREDITS)
+        if not response.ok:
+            raise Exception(f"failed to get credits: {response.status_code}: {response.text}")
+        return _credits_from_billing(response.json())
+
+    def get_credits(self, refresh: bool = False) -> Credits:
+        """Saldo de créditos de la cuenta, reutilizado durante ``SUNO_CREDITS_TTL`` segundos."""
+        return get_credits_cache(self._client.fingerprint).get(self._fetch_credits, refresh)
+
+    def check_credits(self, needed: int = CREDITS_PER_GENERATION) -> None:
+        """Rechaza la generación si la cuenta no tiene ``needed`` créditos.
+
+        Si el saldo no se puede consultar, la generación sigue adelante y será
+        Suno quien la acepte o la rechace.
+
+        Raises:
+            InsufficientCreditsError: Si el saldo conocido no alcanza
+        """
+        try:
+            credits = self.get_credits()
+        except Exception as e:
+            print(f"No se pudo consultar el saldo de créditos: {e}")
+            return
+        if credits.credits_left < needed:
+            raise InsufficientCreditsError(credits.credits_left, needed)
+
     def get_song(self, id: str) -> Song:
-        url = f"{URL_FEED}/?ids={id}"
         print(f"Fetching song with ID: {id}")
+        songs = self.get_songs_by_ids([id])
+        if not songs:
+            raise Exception(f"Song {id} not found")
+        return songs[0]
+
+    def get_songs_by_ids(self, ids: List[str]) -> List[Song]:
+        """Obtiene varias canciones con una sola petición ``/feed/?ids=a,b,c``."""
+        url = f"{URL_FEED}/?ids={','.join(ids)}"
         response = self.request("GET", url)
         if not response.ok:
-            raise Exception(f"Failed to get song: {response.status_code}: {response.text}")
-        data = response.json()
-        song = data[0]
-        song["cover_image_url"] = song.get("image_large_url")
-        return Song(**song)
+            raise Exception(f"Failed to get songs {ids}: {response.status_code}: {response.text}")
+        return [_song_from_clip(song) for song in response.json()]
 
     def get_songs(self) -> List[Song]:
         response = self.request("GET", URL_FEED)
         if not response.ok:
             raise Exception(f"failed to get songs: {response.status_code}: {response.text}")
-        data = response.json()
-        for song in data:
-            song["cover_image_url"] = song.get("image_large_url")
-        return [Song(**song) for song in data]
+        return [_song_from_clip(song) for song in response.json()]
+
+    def get_songs_page(self, page: int) -> List[Song]:
+        """Obtiene una página del feed; una lista vacía indica que no hay más."""
+        response = self.request("GET", f"{URL_FEED}/?page={page}")
+        if not response.ok:
+            raise Exception(f"failed to get songs page {page}: {response.status_code}: {response.text}")
+        return [_song_from_clip(song) for song in response.json()]
+
+    def iter_songs(self, start_page: int = 0, max_pages: Optional[int] = None) -> Iterator[Song]:
+        """Recorre todo el feed página a página.
+
+        Cada página se pide solo cuando se han consumido las canciones de la
+        anterior, así que la memoria usada no crece con el tamaño de la biblioteca.
+        """
+        page = start_page
+        while max_pages is None or page < start_page + max_pages:
+            songs = self.get_songs_page(page)
+            if not songs:
+                return
+            yield from songs
+            page += 1
 
 # ===================== API SONGS ===================== #
 class APIResource:
@@ -398,29 +815,49 @@ class Songs(APIResource):
         title: Optional[str] = None,
         model: str = "chirp-v3-5",
     ) -> List[Song]:
+        # Sin créditos la generación fallaría tras pagar todos los reintentos
+        self._client.check_credits()
         url = URL_GENERATE
-        payload = {
-            "mv": model,
-            "title": "" if not custom else title,
-            "prompt": "" if not custom else prompt,
-            "gpt_description_prompt": prompt if not custom else "",
-            "tags": tags,
-            "negative_tags": negative_tags,
-            "make_instrumental": instrumental,
-            "token": f"P1_{self._client._get_jwt()}",
-        }
+        payload = _generate_payload(
+            prompt, custom, tags, negative_tags, instrumental, title, model,
+            jwt=self._client._get_jwt(),
+        )
         
         response = self.request("POST", url, json=payload)
         response.raise_for_status()
-        return [Song(**clip) for clip in response.json().get("clips", [])]
+        get_credits_cache(self._client._client.fingerprint).spend(CREDITS_PER_GENERATION)
+        return [_song_from_clip(clip) for clip in response.json().get("clips", [])]
+
+    def generate_batch(
+        self,
+        prompts: List[Union[str, Dict[str, Any]]],
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        **kwargs: Any,
+    ) -> List[BatchResult]:
+        """Genera varios prompts a la vez, con como mucho ``max_concurrency`` generaciones en curso.
+
+        Args:
+            prompts: Prompts de texto, o diccionarios con argumentos de ``generate``
+                que sustituyen a ``kwargs`` para ese prompt
+            max_concurrency: Generaciones simultáneas
+            **kwargs: Argumentos comunes de ``generate`` (tags, model...)
+
+        Returns:
+            List[BatchResult]: Un resultado por prompt, en el mismo orden; un
+            prompt que falla no detiene a los demás
+        """
+        return _generate_batch(self.generate, prompts, max_concurrency, kwargs)
 
     def wait_for_file(self, song_id: str, file_type: str = "audio", max_attempts: int = 30, delay: int = 2) -> Song:
         """
         Espera hasta que el archivo (audio o video) de una canción esté disponible.
+
+        La espera se registra en el coordinador de sondeo de la cuenta, que
+        consulta todos los clips pendientes con una única petición por ciclo.
         
         Args:
             song_id: ID de la canción
-            file_type: Tipo de archivo ('audio' o 'video')
+            file_type: Tipo de archivo ('audio', 'video' o 'image')
             max_attempts: Número máximo de intentos
             delay: Tiempo de espera entre intentos en segundos
             
@@ -430,24 +867,141 @@ class Songs(APIResource):
         Raises:
             Exception: Si el archivo no está disponible después de max_attempts
         """
-        attempts = 0
-        while attempts < max_attempts:
-            song = self._client.get_song(song_id)
-            
-            if file_type == "audio" and song.audio_url:
-                return song
-            elif file_type == "video" and song.video_url:
-                return song
-            elif file_type == "image" and song.cover_image_url:
-                return song
-                
-            print(f"Archivo {file_type} no disponible aún. Intento {attempts + 1}/{max_attempts} {song}")
-            time.sleep(delay)
-            attempts += 1
-            
-        raise Exception(f"Tiempo de espera agotado esperando el archivo {file_type} para la canción {song_id}")
+        watch = self.watch_file(song_id, file_type, timeout=max_attempts * delay, interval=delay)
+        try:
+            return watch.result()
+        except TimeoutError:
+            raise Exception(f"Tiempo de espera agotado esperando el archivo {file_type} para la canción {song_id}")
+
+    def watch_file(self, song_id: str, file_type: str = "audio", timeout: Optional[float] = None, interval: float = 2) -> FeedWatch:
+        """Registra, sin bloquear, una espera hasta que el archivo pedido esté disponible."""
+        def is_ready(song: Song) -> bool:
+            if _file_url(song, file_type):
+                return True
+            print(f"Archivo {file_type} no disponible aún para {song_id} (estado: {song.status})")
+            return False
+
+        return get_poller(self._client).watch(song_id, is_ready, timeout=timeout, interval=interval, condition=file_type)
+
+    def watch_files(
+        self,
+        song_id: str,
+        file_types: List[str],
+        on_ready: Callable[[str, Song], None],
+        timeout: Optional[float] = None,
+        interval: float = 2,
+    ) -> FeedWatch:
+        """Registra una única espera para varios tipos de archivo de la misma canción.
+
+        Cada respuesta del feed se comprueba contra todos los tipos pendientes y
+        ``on_ready(file_type, song)`` se llama en cuanto aparece la URL de cada
+        uno, mientras los demás siguen esperando. La espera termina cuando todos
+        están disponibles.
+        """
+        pending = list(file_types)
+
+        def on_update(song: Song) -> bool:
+            for file_type in list(pending):
+                if _file_url(song, file_type):
+                    pending.remove(file_type)
+                    on_ready(file_type, song)
+            if pending:
+                print(f"Archivos {pending} no disponibles aún para {song_id} (estado: {song.status})")
+            return not pending
+
+        return get_poller(self._client).watch(
+            song_id, on_update, timeout=timeout, interval=interval, condition="+".join(sorted(file_types))
+        )
 
 # ===================== FUNCIONES AUXILIARES ===================== #
+# Campos de Song en orden, con su valor por defecto, y los obligatorios
+_SONG_DEFAULTS = {name: field.default for name, field in Song.__fields__.items()}
+_SONG_REQUIRED = frozenset(name for name, field in Song.__fields__.items() if field.required)
+
+def _song_from_clip(clip: Dict[str, Any], validate: bool = False) -> Song:
+    """Construye un Song a partir de un clip del feed o de la respuesta de generación.
+
+    Los clips que devuelve Suno son de confianza: si traen todos los campos
+    obligatorios, el Song se crea con ``Song.construct`` sin volver a
+    validarlos, entre 2,0 y 2,3 veces más rápido en feeds de 20 a 5000 clips
+    (ver ``benchmarks/bench_song_model.py``). Con ``validate=True`` o si falta
+    algún campo se valida como siempre. ``clip`` no se modifica.
+    """
+    if validate or not _SONG_REQUIRED.issubset(clip.keys()):
+        return Song(**{**clip, "cover_image_url": clip.get("image_large_url")})
+    values = {name: clip.get(name, default) for name, default in _SONG_DEFAULTS.items()}
+    values["cover_image_url"] = clip.get("image_large_url")
+    return Song.construct(**values)
+
+def _credits_from_billing(data: Dict[str, Any]) -> Credits:
+    """Construye un Credits a partir de la respuesta de ``/billing/info``.
+
+    Raises:
+        ValueError: Si la respuesta no trae un saldo numérico; un saldo
+            desconocido no debe confundirse con uno a cero
+    """
+    credits_left = data.get("total_credits_left")
+    if isinstance(credits_left, bool) or not isinstance(credits_left, (int, float)):
+        raise ValueError(f"/billing/info no trae un saldo numérico en total_credits_left: {credits_left!r}")
+    return Credits(
+        credits_left=int(credits_left),
+        period=data.get("period"),
+        monthly_limit=data.get("monthly_limit"),
+        monthly_usage=data.get("monthly_usage"),
+    )
+
+def _generate_batch(
+    generate: Callable[..., List[Song]],
+    prompts: List[Union[str, Dict[str, Any]]],
+    max_concurrency: int,
+    defaults: Dict[str, Any],
+) -> List[BatchResult]:
+    """Ejecuta ``generate`` para cada prompt en un pool de ``max_concurrency`` hilos."""
+    def run(item: Union[str, Dict[str, Any]]) -> BatchResult:
+        params = {**defaults, **(item if isinstance(item, dict) else {"prompt": item})}
+        try:
+            return BatchResult(params["prompt"], songs=generate(**params))
+        except Exception as e:
+            print(f"Error generando '{params.get('prompt', '')[:40]}': {e}")
+            return BatchResult(params.get("prompt", ""), error=e)
+
+    if not prompts:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(prompts))), thread_name_prefix="suno-batch") as executor:
+        return list(executor.map(run, prompts))
+
+def _generate_payload(
+    prompt: str,
+    custom: bool,
+    tags: str,
+    negative_tags: str,
+    instrumental: bool,
+    title: Optional[str],
+    model: str,
+    jwt: str,
+) -> Dict[str, Any]:
+    """Cuerpo de la petición a ``URL_GENERATE``."""
+    return {
+        "mv": model,
+        "title": "" if not custom else title,
+        "prompt": "" if not custom else prompt,
+        "gpt_description_prompt": prompt if not custom else "",
+        "tags": tags,
+        "negative_tags": negative_tags,
+        "make_instrumental": instrumental,
+        "token": f"P1_{jwt}",
+    }
+
+def _file_url(song: Song, file_type: str) -> Optional[str]:
+    """Devuelve la URL del tipo de archivo pedido, o None si aún no existe."""
+    if file_type == "audio":
+        return song.audio_url or None
+    elif file_type == "video":
+        return song.video_url or None
+    elif file_type == "image":
+        return song.cover_image_url or None
+    raise ValueError(f"Invalid file type: {file_type}")
+
 def _get_id(song: Union[str, Song]) -> str:
     if isinstance(song, Song):
         return song.id
@@ -31,11 +31,39 @@ def test_api():
                 "model": "chirp-v3-5"
             }
         },
+        {
+            "name": "Submit Job",
+            "method": "POST",
+            "endpoint": "/jobs",
+            "data": {
+                "prompt": "Una canción de rock en español",
+                "cookie": COOKIE,
+                "custom": False,
+                "tags": "Rock",
+                "negative_tags": "pop",
+                "instrumental": False,
+                "title": None,
+                "model": "chirp-v3-5",
+                "wait_for": "audio"
+            }
+        },
+        {
+            "name": "Get Credits",
+            "method": "GET",
+            "endpoint": "/credits",
+            "params": {"cookie": COOKIE}
+        },
         {
             "name": "Get Songs",
             "method": "GET",
             "endpoint": "/songs",
             "params": {"cookie": COOKIE}
+        },
+        {
+            "name": "Stream Songs",
+            "method": "GET",
+            "endpoint": "/songs",
+            "params": {"cookie": COOKIE, "stream": "true", "max_pages": 2}
         }
     ]
 
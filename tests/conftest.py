@@ -0,0 +1,55 @@
+"""Utilidades comunes de los tests: respuestas simuladas y clientes sin red."""
+import os
+import sys
+import uuid
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from suno.ratelimit import TokenBucket  # noqa: E402
+from suno.suno_client import CloudflareBypassClient, RetryPolicy  # noqa: E402
+
+
+class FakeResponse:
+    """Lo justo de ``curl_cffi.requests.Response`` para el cliente."""
+
+    def __init__(self, status_code=200, json_data=None, headers=None, text=""):
+        self.status_code = status_code
+        self._json = json_data if json_data is not None else {}
+        self.headers = headers or {}
+        self.text = text
+        self.cookies = {}
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def json(self):
+        return self._json
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise Exception(f"HTTP {self.status_code}")
+
+
+@pytest.fixture
+def make_client():
+    """Crea un cliente con cookie única cuyo ``_send`` llama a ``responder(method, url, kwargs)``."""
+    def factory(responder, retry_policy=None):
+        client = CloudflareBypassClient(
+            f"__client={uuid.uuid4().hex}",
+            retry_policy=retry_policy or RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.02, budget=5),
+        )
+        client._limiter = TokenBucket(rate=0)
+        client.calls = []
+
+        def send(method, url, **kwargs):
+            # Mismas cabeceras que enviaría el _send real
+            kwargs["headers"] = {**client.headers, **(kwargs.get("headers") or {})}
+            client.calls.append((method, url, kwargs["headers"]))
+            return responder(method, url, kwargs)
+
+        client._send = send
+        return client
+    return factory
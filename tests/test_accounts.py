@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+
+import pytest
+
+from suno.accounts import Account, AccountPool
+
+
+class FakeClient:
+    def __init__(self, songs):
+        self.songs = songs
+        self.lookups = 0
+
+    def get_song(self, song_id):
+        self.lookups += 1
+        if song_id not in self.songs:
+            raise Exception(f"Song {song_id} not found")
+        return self.songs[song_id]
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    clients = {"a=1": FakeClient({}), "b=2": FakeClient({"clip_b": SimpleNamespace(id="clip_b")})}
+    monkeypatch.setattr(Account, "client", property(lambda account: clients[account.cookie]))
+    return AccountPool(list(clients)), clients
+
+
+def test_owner_of_finds_clip_in_other_account(pool):
+    accounts, clients = pool
+    assert accounts.owner_of("clip_b").cookie == "b=2"
+    # La dueña queda anotada y no se vuelve a buscar
+    assert accounts.owner_of("clip_b").cookie == "b=2"
+    assert clients["b=2"].lookups == 1
+
+
+def test_owner_of_unknown_clip_raises(pool):
+    accounts, _ = pool
+    with pytest.raises(Exception, match="not found"):
+        accounts.owner_of("missing")
+
+
+def test_single_account_is_not_searched(monkeypatch):
+    client = FakeClient({})
+    monkeypatch.setattr(Account, "client", property(lambda account: client))
+    assert AccountPool(["a=1"]).owner_of("clip").cookie == "a=1"
+    assert client.lookups == 0
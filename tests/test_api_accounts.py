@@ -0,0 +1,70 @@
+"""Endpoints del proxy con varias cuentas configuradas."""
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from suno import api
+from suno.accounts import Account
+from suno.suno_client import Credits
+
+COOKIES = "a=1\nb=2"
+
+
+class FakeAccountClient:
+    def __init__(self, credits, songs):
+        self.credits = credits
+        self.feed = songs
+
+    async def get_credits(self, refresh=False):
+        return self.credits
+
+    async def get_songs(self):
+        return self.feed
+
+    @property
+    def songs(self):
+        return SimpleNamespace(generate=lambda **kwargs: self.feed)
+
+
+def song(song_id, created_at):
+    return api.Song.construct(id=song_id, status="complete", audio_url=None, video_url=None,
+                              cover_image_url=None, created_at=created_at)
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    clients = {
+        "a=1": FakeAccountClient(Credits(credits_left=30, period="month", monthly_limit=50, monthly_usage=20),
+                                 [song("a_old", "2024-01-01T00:00:00Z")]),
+        "b=2": FakeAccountClient(Credits(credits_left=40, period="month", monthly_limit=50, monthly_usage=10),
+                                 [song("b_new", "2024-02-01T00:00:00Z")]),
+    }
+    monkeypatch.setattr(Account, "client", property(lambda account: clients[account.cookie]))
+    monkeypatch.setattr(Account, "async_client", property(lambda account: clients[account.cookie]))
+    keys = []
+    semaphore = api._account_semaphore
+    monkeypatch.setattr(api, "_account_semaphore", lambda cookie: keys.append(cookie) or semaphore(cookie))
+    api._song_listings.clear()
+    return keys
+
+
+def test_credits_are_summed_across_accounts(clients):
+    credits = asyncio.run(api.get_credits(cookie=COOKIES, refresh=False))
+    assert credits.credits_left == 70
+    assert credits.monthly_usage == 30
+    assert credits.period == "month"
+
+
+def test_song_listing_merges_all_feeds(clients):
+    body, etag = asyncio.run(api.cached_song_listing(COOKIES))
+    assert [item["id"] for item in json.loads(body)] == ["b_new", "a_old"]
+
+
+def test_upstream_calls_are_capped_per_serving_account(clients):
+    asyncio.run(api.get_credits(cookie=COOKIES, refresh=False))
+    asyncio.run(api.generate_song(api.GenerateRequest(prompt="lofi", cookie=COOKIES)))
+    # Cada llamada ocupa el límite de la cuenta que la atiende, nunca el del texto con todas las cookies
+    assert set(clients) <= {"a=1", "b=2"}
+    assert len(clients) == 3
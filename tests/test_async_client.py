@@ -0,0 +1,81 @@
+"""Cliente asíncrono: reintentos sin bloquear, espera de archivos y uso desde el proxy."""
+import asyncio
+import threading
+import uuid
+
+import pytest
+
+from conftest import FakeResponse
+from suno import api
+from suno.async_client import AsyncSuno
+from suno.ratelimit import TokenBucket
+from suno.suno_client import URL_FEED, RetryPolicy, SunoRequestError
+from test_song_model import CLIP
+
+
+def make_async_client(responder):
+    """AsyncSuno con cookie única cuyo ``_send`` llama a ``responder(method, url)``."""
+    suno = AsyncSuno(f"__client={uuid.uuid4().hex}",
+                     retry_policy=RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.02, budget=5))
+    suno._client._limiter = TokenBucket(rate=0)
+    suno._client.headers["Authorization"] = "Bearer test"
+    suno.calls = []
+
+    async def send(method, url, **kwargs):
+        suno.calls.append((method, url))
+        return responder(method, url)
+
+    suno._client._send = send
+    return suno
+
+
+def clip(status, audio_url=""):
+    return {**CLIP, "status": status, "audio_url": audio_url}
+
+
+def test_transient_errors_are_retried():
+    responses = iter([FakeResponse(503), FakeResponse(json_data=[CLIP])])
+    suno = make_async_client(lambda method, url: next(responses))
+
+    song = asyncio.run(suno.get_song("clip_1"))
+    assert song.id == "clip_1"
+    assert suno.calls == [("GET", f"{URL_FEED}/?ids=clip_1")] * 2
+
+
+def test_non_retryable_status_fails_at_once():
+    suno = make_async_client(lambda method, url: FakeResponse(404, text="missing"))
+
+    with pytest.raises(SunoRequestError) as info:
+        asyncio.run(suno.get_songs())
+    assert info.value.status_code == 404
+    assert len(suno.calls) == 1
+
+
+def test_wait_for_file_returns_once_the_file_is_ready():
+    responses = iter([[clip("queued")], [clip("streaming")], [clip("complete", "https://cdn1.suno.ai/clip_1.mp3")]])
+    suno = make_async_client(lambda method, url: FakeResponse(json_data=next(responses)))
+
+    song = asyncio.run(suno.songs.wait_for_file("clip_1", delay=0))
+    assert song.audio_url == "https://cdn1.suno.ai/clip_1.mp3"
+    assert len(suno.calls) == 3
+
+
+def test_wait_for_file_stops_on_failed_generation():
+    suno = make_async_client(lambda method, url: FakeResponse(json_data=[clip("error")]))
+
+    with pytest.raises(Exception, match="falló"):
+        asyncio.run(suno.songs.wait_for_file("clip_1", max_attempts=30, delay=0))
+    assert len(suno.calls) == 1
+
+
+def test_proxy_awaits_async_reads_on_the_event_loop():
+    threads = []
+
+    async def get_song(song_id):
+        threads.append(threading.current_thread())
+        return song_id
+
+    song_id = asyncio.run(api.run_upstream("a=1", get_song, "clip_1"))
+    assert song_id == "clip_1"
+    # Sin pasar por el pool de hilos
+    assert threads == [threading.main_thread()]
@@ -0,0 +1,102 @@
+"""Obtención y renovación del SID y el JWT de una cuenta."""
+import threading
+
+from suno.suno_client import URL_FEED, URL_SID
+from conftest import FakeResponse
+
+
+def clerk_responder(method, url, kwargs):
+    if url == URL_SID:
+        return FakeResponse(json_data={"response": {"last_active_session_id": "sid_1"}})
+    if "/tokens" in url:
+        return FakeResponse(json_data={"jwt": "header.payload.signature"})
+    return FakeResponse(json_data=[])
+
+
+def run_with_timeout(fn, timeout=5):
+    """Ejecuta ``fn`` en otro hilo y falla si no termina a tiempo (bloqueo)."""
+    result = {}
+
+    def target():
+        try:
+            result["value"] = fn()
+        except Exception as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "la llamada se ha quedado bloqueada"
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+def test_get_jwt_from_cold_cache(make_client):
+    client = make_client(clerk_responder)
+
+    assert run_with_timeout(client._get_jwt) == "header.payload.signature"
+    assert client._sid == "sid_1"
+    urls = [url for _, url, _ in client.calls]
+    assert urls[0] == URL_SID
+    assert "/sessions/sid_1/tokens" in urls[1]
+
+
+def test_get_jwt_is_cached(make_client):
+    client = make_client(clerk_responder)
+    run_with_timeout(client._get_jwt)
+    calls = len(client.calls)
+
+    assert run_with_timeout(client._get_jwt) == "header.payload.signature"
+    assert len(client.calls) == calls
+
+
+def rotating_responder(stale_sid, status):
+    """Clerk con la sesión ``stale_sid`` revocada: sus tokens responden ``status``."""
+    def responder(method, url, kwargs):
+        if url == URL_SID:
+            return FakeResponse(json_data={"response": {"last_active_session_id": "sid_2"}})
+        if f"/sessions/{stale_sid}/tokens" in url:
+            return FakeResponse(status)
+        return clerk_responder(method, url, kwargs)
+    return responder
+
+
+def test_revoked_cached_sid_is_replaced(make_client):
+    client = make_client(rotating_responder("sid_1", 401))
+    client._tokens.sid = "sid_1"
+
+    assert run_with_timeout(client._get_jwt) == "header.payload.signature"
+    assert client._sid == "sid_2"
+    urls = [url for _, url, _ in client.calls]
+    assert "/sessions/sid_1/tokens" in urls[0]
+    assert urls[1] == URL_SID
+    assert "/sessions/sid_2/tokens" in urls[2]
+
+
+def test_unknown_session_on_renew_fetches_new_sid(make_client):
+    def responder(method, url, kwargs):
+        if url == URL_FEED and kwargs["headers"].get("Authorization") != "Bearer header.payload.signature":
+            return FakeResponse(401)
+        return rotating_responder("sid_1", 404)(method, url, kwargs)
+
+    client = make_client(responder)
+    client._tokens.sid = "sid_1"
+
+    assert run_with_timeout(lambda: client.request("GET", URL_FEED)).status_code == 200
+    assert client._sid == "sid_2"
+
+
+def test_new_client_uses_cached_jwt_before_refreshing(make_client):
+    def responder(method, url, kwargs):
+        if url == URL_FEED and kwargs["headers"].get("Authorization") != "Bearer cached.jwt.token":
+            return FakeResponse(401)
+        return clerk_responder(method, url, kwargs)
+
+    client = make_client(responder)
+    # JWT vigente que otro cliente de la misma cuenta dejó en la caché
+    client._tokens.sid = "sid_1"
+    client._tokens.store_jwt("cached.jwt.token")
+
+    assert run_with_timeout(lambda: client.request("GET", URL_FEED)).status_code == 200
+    assert [url for _, url, _ in client.calls] == [URL_FEED, URL_FEED]
@@ -0,0 +1,79 @@
+"""Generación por lotes con un límite de generaciones simultáneas."""
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from suno.accounts import Account, AccountPool
+from suno.suno_client import _generate_batch
+
+
+class ConcurrencyProbe:
+    """``generate`` simulado que anota cuántas llamadas hay en curso a la vez."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.active = 0
+        self.peak = 0
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, **params):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.calls.append(params)
+        try:
+            time.sleep(0.02)
+            if params["prompt"] in self.fail:
+                raise RuntimeError(f"failed {params['prompt']}")
+            return [SimpleNamespace(id=f"{params['prompt']}_{index}") for index in range(2)]
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 3])
+def test_generations_in_flight_never_exceed_the_limit(max_concurrency):
+    generate = ConcurrencyProbe()
+    results = _generate_batch(generate, [f"p{index}" for index in range(8)], max_concurrency, {})
+    assert len(results) == 8
+    assert generate.peak == max_concurrency
+
+
+def test_results_keep_prompt_order_and_failures_do_not_stop_the_batch():
+    generate = ConcurrencyProbe(fail={"p1"})
+    results = _generate_batch(generate, ["p0", "p1", "p2"], 2, {})
+
+    assert [result.prompt for result in results] == ["p0", "p1", "p2"]
+    assert [result.ok for result in results] == [True, False, True]
+    assert [song.id for song in results[2].songs] == ["p2_0", "p2_1"]
+    assert "failed p1" in str(results[1].error)
+
+
+def test_prompt_objects_override_the_common_arguments():
+    generate = ConcurrencyProbe()
+    _generate_batch(generate, ["plain", {"prompt": "custom", "tags": "jazz"}], 1, {"tags": "pop", "model": "m"})
+
+    assert generate.calls == [
+        {"prompt": "plain", "tags": "pop", "model": "m"},
+        {"prompt": "custom", "tags": "jazz", "model": "m"},
+    ]
+
+
+def test_empty_batch():
+    assert _generate_batch(ConcurrencyProbe(), [], 4, {}) == []
+
+
+def test_pool_batch_is_bounded_and_spread_over_accounts(monkeypatch):
+    probes = {"a=1": ConcurrencyProbe(), "b=2": ConcurrencyProbe()}
+    clients = {cookie: SimpleNamespace(songs=SimpleNamespace(generate=probe)) for cookie, probe in probes.items()}
+    monkeypatch.setattr(Account, "client", property(lambda account: clients[account.cookie]))
+    accounts = AccountPool(list(clients))
+
+    results = accounts.generate_batch([f"p{index}" for index in range(6)], max_concurrency=2)
+    assert all(result.ok for result in results)
+    # Dos generaciones a la vez, cada una en la cuenta menos cargada
+    assert sum(len(probe.calls) for probe in probes.values()) == 6
+    assert all(probe.peak == 1 for probe in probes.values())
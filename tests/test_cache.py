@@ -0,0 +1,63 @@
+import os
+
+from suno.cache import AssetCache, _url_key
+
+
+def write(path, size):
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    return path
+
+
+def test_lru_eviction_removes_oldest_files(tmp_path):
+    cache = AssetCache(str(tmp_path), max_bytes=25)
+    first = write(str(tmp_path / "a.mp3"), 10)
+    cache.store("https://cdn1.suno.ai/a.mp3", first)
+    second = write(str(tmp_path / "b.mp3"), 10)
+    cache.store("https://cdn1.suno.ai/b.mp3", second)
+    assert cache.lookup("https://cdn1.suno.ai/a.mp3") == first
+
+    # b es ahora la menos usada y es la que se expulsa
+    third = write(str(tmp_path / "c.mp3"), 10)
+    cache.store("https://cdn1.suno.ai/c.mp3", third)
+    assert cache.lookup("https://cdn1.suno.ai/b.mp3") is None
+    assert not os.path.exists(second)
+    assert cache.lookup("https://cdn1.suno.ai/a.mp3") == first
+    assert cache.lookup("https://cdn1.suno.ai/c.mp3") == third
+
+
+def test_urls_sharing_a_file_do_not_evict_it(tmp_path):
+    cache = AssetCache(str(tmp_path), max_bytes=15)
+    path = str(tmp_path / "clip.mp3")
+    cache.store("https://audiopipe.suno.ai/?item_id=clip", write(path, 10))
+    cache.store("https://cdn1.suno.ai/clip.mp3", write(path, 12))
+
+    # Un archivo nuevo cabe junto al clip, que solo cuenta una vez
+    cache.store("https://cdn1.suno.ai/cover.jpg", write(str(tmp_path / "cover.jpg"), 3))
+    assert cache.lookup("https://cdn1.suno.ai/clip.mp3") == path
+    assert os.path.exists(path)
+    # La URL antigua ya no apunta al archivo
+    assert cache.lookup("https://audiopipe.suno.ai/?item_id=clip") is None
+
+
+def test_eviction_never_deletes_a_file_another_row_uses(tmp_path):
+    # Índices escritos antes de que store() deduplicara por ruta
+    cache = AssetCache(str(tmp_path), max_bytes=12)
+    clip = write(str(tmp_path / "clip.mp3"), 10)
+    other = write(str(tmp_path / "other.mp3"), 5)
+    rows = (
+        ("https://audiopipe.suno.ai/?item_id=clip", clip, 10, 1),
+        ("https://cdn1.suno.ai/other.mp3", other, 5, 2),
+        ("https://cdn1.suno.ai/clip.mp3", clip, 10, 3),
+    )
+    with cache._connect() as db:
+        for url, path, size, access in rows:
+            db.execute(
+                "INSERT INTO assets (key, url, path, size, etag, last_access) VALUES (?, ?, ?, ?, NULL, ?)",
+                (_url_key(url), url, path, size, access),
+            )
+        cache._evict(db, keep="")
+
+    assert os.path.exists(clip)
+    assert not os.path.exists(other)
+    assert cache.lookup("https://cdn1.suno.ai/clip.mp3") == clip
@@ -0,0 +1,77 @@
+import asyncio
+import uuid
+
+import pytest
+
+from conftest import FakeResponse
+from suno.async_client import AsyncSuno
+from suno.suno_client import URL_CREDITS, Credits, CreditsCache, Suno, SunoRequestError, _credits_from_billing
+
+
+def make_credits(left):
+    return Credits(credits_left=left, period="month", monthly_limit=50, monthly_usage=50 - left)
+
+
+def failing_fetch():
+    raise RuntimeError("billing down")
+
+
+def test_failed_lookup_is_cached():
+    cache = CreditsCache(ttl=30, failure_ttl=30)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        raise RuntimeError("billing down")
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            cache.get(fetch)
+    assert len(calls) == 1
+
+
+def test_failed_lookup_expires_and_refresh_bypasses_it():
+    cache = CreditsCache(ttl=30, failure_ttl=0)
+    with pytest.raises(RuntimeError):
+        cache.get(failing_fetch)
+    assert cache.get(lambda: make_credits(40)).credits_left == 40
+
+    cache = CreditsCache(ttl=0, failure_ttl=30)
+    with pytest.raises(RuntimeError):
+        cache.get(failing_fetch)
+    assert cache.get(lambda: make_credits(20), refresh=True).credits_left == 20
+
+
+def test_billing_without_balance_is_unknown_not_zero():
+    with pytest.raises(ValueError):
+        _credits_from_billing({"credits": 500})
+    with pytest.raises(ValueError):
+        _credits_from_billing({"total_credits_left": "n/a"})
+    assert _credits_from_billing({"total_credits_left": 500}).credits_left == 500
+
+
+def test_check_credits_proceeds_when_balance_is_unknown():
+    suno = Suno(f"__client={uuid.uuid4().hex}")
+    suno._client.request = lambda *args, **kwargs: FakeResponse(json_data={"credits": 500})
+    suno.check_credits()
+
+
+def test_async_failed_lookup_is_cached_and_shared():
+    client = AsyncSuno(f"__client={uuid.uuid4().hex}")
+    calls = []
+
+    async def failing_request(method, url, **kwargs):
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        raise SunoRequestError("billing down")
+
+    client._client.request = failing_request
+
+    async def main():
+        results = await asyncio.gather(*(client.get_credits() for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(result, SunoRequestError) for result in results)
+        # Las generaciones siguientes no vuelven a gastar el presupuesto de reintentos
+        await client.check_credits()
+
+    asyncio.run(main())
+    assert calls == [URL_CREDITS]
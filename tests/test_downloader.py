@@ -0,0 +1,107 @@
+import os
+
+from suno.downloader import cached_download, stream_download
+
+
+class FakeStreamResponse:
+    def __init__(self, status_code, headers, body=b""):
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise AssertionError(f"unexpected status {self.status_code}")
+
+    def iter_content(self):
+        yield self.body
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def stream(self, method, url, headers=None, **kwargs):
+        self.requests.append(headers or {})
+        return self.responses.pop(0)
+
+
+def test_416_keeps_complete_part_file(tmp_path):
+    path = str(tmp_path / "clip.mp3")
+    with open(f"{path}.part", "wb") as f:
+        f.write(b"x" * 10)
+    # El cuerpo del 416 trae su propio Content-Length, que no es el del archivo
+    session = FakeSession([FakeStreamResponse(416, {"Content-Range": "bytes */10", "Content-Length": "0"})])
+
+    assert stream_download("https://cdn1.suno.ai/clip.mp3", path, session=session) == path
+    with open(path, "rb") as f:
+        assert f.read() == b"x" * 10
+    assert session.requests == [{"Range": "bytes=10-"}]
+
+
+def test_416_restarts_when_part_file_does_not_match(tmp_path):
+    path = str(tmp_path / "clip.mp3")
+    with open(f"{path}.part", "wb") as f:
+        f.write(b"x" * 12)
+    session = FakeSession([
+        FakeStreamResponse(416, {"Content-Range": "bytes */10"}),
+        FakeStreamResponse(200, {"Content-Length": "10"}, b"y" * 10),
+    ])
+
+    stream_download("https://cdn1.suno.ai/clip.mp3", path, session=session)
+    with open(path, "rb") as f:
+        assert f.read() == b"y" * 10
+    assert not os.path.exists(f"{path}.part")
+
+
+def test_downloads_through_the_shared_pool(tmp_path):
+    import functools
+    import http.server
+    import threading
+
+    (tmp_path / "cdn").mkdir()
+    (tmp_path / "cdn" / "clip.mp3").write_bytes(b"z" * 300_000)
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=str(tmp_path / "cdn"))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        path = str(tmp_path / "clip.mp3")
+        stream_download(f"http://127.0.0.1:{server.server_port}/clip.mp3", path)
+        assert os.path.getsize(path) == 300_000
+    finally:
+        server.shutdown()
+
+
+def test_concurrent_downloads_to_one_path_share_the_part_file(tmp_path):
+    import threading
+    import time
+
+    class SlowResponse(FakeStreamResponse):
+        def iter_content(self):
+            for _ in range(5):
+                time.sleep(0.01)
+                yield b"a" * 10
+
+    session = FakeSession([SlowResponse(200, {"Content-Length": "50"}), SlowResponse(200, {"Content-Length": "50"})])
+    path = str(tmp_path / "clip.mp3")
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cached_download("https://cdn1.suno.ai/clip.mp3", path, session=session)))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [path, path]
+    # El segundo hilo encuentra el archivo en la caché en lugar de escribir en el mismo .part
+    assert len(session.requests) == 1
+    assert os.path.getsize(path) == 50
@@ -0,0 +1,36 @@
+import asyncio
+
+from suno.http_pool import SessionPool
+
+
+def test_sync_sessions_are_shared_per_proxy_config():
+    pool = SessionPool()
+    assert pool.session() is pool.session()
+    assert pool.session({"https": "http://proxy:8080"}) is not pool.session()
+    pool.close()
+    assert pool._sessions == {}
+
+
+def test_async_sessions_are_closed_on_shutdown():
+    pool = SessionPool()
+
+    async def main():
+        session = pool.async_session()
+        assert pool.async_session() is session
+        await pool.aclose()
+        assert pool._async_sessions.get(asyncio.get_running_loop()) is None
+        # Tras cerrarlas, el loop obtiene una sesión nueva si vuelve a necesitarla
+        assert pool.async_session() is not session
+        await pool.aclose()
+
+    asyncio.run(main())
+
+
+def test_host_slots_limit_concurrency_per_host():
+    pool = SessionPool(max_per_host=1)
+    with pool.host_slot("https://cdn1.suno.ai/a.mp3"):
+        slot = pool._host_slots["cdn1.suno.ai"]
+        assert not slot.acquire(blocking=False)
+        # Otro host tiene su propio límite
+        with pool.host_slot("https://studio-api.prod.suno.com/api/feed"):
+            pass
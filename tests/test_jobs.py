@@ -0,0 +1,110 @@
+"""Cola de trabajos del proxy y endpoints /jobs."""
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from suno import api
+from suno.accounts import Account
+from suno.jobs import COMPLETE, FAILED, JobManager, JobQueueFull
+from test_api_accounts import song
+
+
+def wait_until_finished(manager, job):
+    deadline = time.monotonic() + 5
+    while not job.finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return manager.get(job.id)
+
+
+def test_job_runs_in_background_and_completes():
+    manager = JobManager(max_workers=1)
+    release = threading.Event()
+
+    def work(job):
+        release.wait(5)
+        job.update(progress="done", result=[{"id": "clip_1"}])
+
+    job = manager.submit(work)
+    # submit responde sin esperar al trabajo
+    assert not job.finished
+    release.set()
+
+    job = wait_until_finished(manager, job)
+    assert job.status == COMPLETE
+    assert job.progress == "done"
+    assert job.result == [{"id": "clip_1"}]
+    manager.shutdown()
+
+
+def test_failed_job_keeps_the_error():
+    manager = JobManager(max_workers=1)
+
+    def work(job):
+        raise RuntimeError("upstream down")
+
+    job = wait_until_finished(manager, manager.submit(work))
+    assert job.status == FAILED
+    assert job.error == "upstream down"
+    manager.shutdown()
+
+
+def test_pending_jobs_are_bounded():
+    manager = JobManager(max_workers=1, max_pending=2)
+    release = threading.Event()
+    jobs = [manager.submit(lambda job: release.wait(5)) for _ in range(2)]
+
+    with pytest.raises(JobQueueFull):
+        manager.submit(lambda job: None)
+    release.set()
+    for job in jobs:
+        wait_until_finished(manager, job)
+    # Los terminados ya no cuentan como pendientes
+    manager.submit(lambda job: None)
+    manager.shutdown()
+
+
+def test_finished_jobs_expire_after_ttl():
+    manager = JobManager(max_workers=1, ttl=0)
+    job = wait_until_finished(manager, manager.submit(lambda job: None))
+    time.sleep(0.01)
+    manager.submit(lambda job: None)
+    assert manager.get(job.id) is None
+    manager.shutdown()
+
+
+class FakeJobClient:
+    def __init__(self):
+        self.generated = [song("clip_1", "2024-01-01T00:00:00Z"), song("clip_2", "2024-01-01T00:00:00Z")]
+
+    async def check_credits(self):
+        return None
+
+    @property
+    def songs(self):
+        return SimpleNamespace(generate=lambda **kwargs: self.generated)
+
+
+def test_job_endpoints_return_at_once_and_report_the_clips(monkeypatch):
+    client = FakeJobClient()
+    monkeypatch.setattr(Account, "client", property(lambda account: client))
+    monkeypatch.setattr(Account, "async_client", property(lambda account: client))
+    monkeypatch.setattr(api, "jobs", JobManager(max_workers=1))
+
+    request = api.JobRequest(prompt="lofi", cookie="jobs=1", wait_for=None)
+    submitted = asyncio.run(api.submit_job(request))
+    assert submitted.id
+
+    job = wait_until_finished(api.jobs, api.jobs.get(submitted.id))
+    response = asyncio.run(api.get_job(submitted.id))
+    assert job.status == response.status == COMPLETE
+    assert [clip.id for clip in response.clips] == ["clip_1", "clip_2"]
+    api.jobs.shutdown()
+
+
+def test_unknown_job_is_404():
+    with pytest.raises(api.HTTPException) as info:
+        asyncio.run(api.get_job("missing"))
+    assert info.value.status_code == 404
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from suno.poller import AdaptivePollStrategy, FeedWatch
+
+
+def clip(status="queued", age=0.0, model="chirp-v3"):
+    created = datetime.now(timezone.utc) - timedelta(seconds=age)
+    return SimpleNamespace(status=status, model_name=model, created_at=created.isoformat())
+
+
+def watch(condition="audio", interval=2.0, polls=2):
+    w = FeedWatch("clip", lambda song: True, interval=interval, condition=condition)
+    w.polls = polls
+    return w
+
+
+@pytest.fixture
+def strategy():
+    return AdaptivePollStrategy(min_delay=0.5, max_delay=15, jitter=0, smoothing=0.5)
+
+
+def test_estimate_is_kept_per_model_and_condition(strategy):
+    strategy.observe_ready(watch("audio"), clip(age=30))
+    strategy.observe_ready(watch("video"), clip(age=120))
+
+    assert strategy.expected_ready_time("chirp-v3", "audio") == pytest.approx(30, abs=1)
+    assert strategy.expected_ready_time("chirp-v3", "video") == pytest.approx(120, abs=1)
+    assert strategy.expected_ready_time("chirp-v3", "status") is None
+
+
+def test_estimate_is_smoothed_and_ignores_first_poll_hits(strategy):
+    strategy.observe_ready(watch(), clip(age=30))
+    strategy.observe_ready(watch(), clip(age=50))
+    # Listo ya en la primera consulta: no se sabe cuándo lo estuvo
+    strategy.observe_ready(watch(polls=1), clip(age=500))
+
+    assert strategy.expected_ready_time("chirp-v3", "audio") == pytest.approx(40, abs=1)
+
+
+def test_delay_follows_status_without_estimate(strategy):
+    assert strategy.next_delay(watch(), clip("submitted")) == pytest.approx(6)
+    assert strategy.next_delay(watch(), clip("queued")) == pytest.approx(4)
+    assert strategy.next_delay(watch(), clip("streaming")) == pytest.approx(2)
+
+
+def test_delay_is_spread_far_from_and_tightened_near_the_estimate(strategy):
+    strategy.observe_ready(watch(), clip(age=60))
+
+    assert strategy.next_delay(watch(), clip("streaming", age=40)) == pytest.approx(10, abs=0.5)
+    assert strategy.next_delay(watch(), clip("streaming", age=59)) == pytest.approx(1)
+
+
+def test_overdue_clip_goes_back_to_status_delay(strategy):
+    strategy.observe_ready(watch(), clip(age=60))
+
+    # Atascado en "queued" mucho después de lo previsto: no se sondea al ritmo máximo
+    assert strategy.next_delay(watch(), clip("queued", age=300)) == pytest.approx(4)
+
+
+def test_other_conditions_do_not_skew_the_schedule(strategy):
+    strategy.observe_ready(watch("video"), clip(age=300))
+
+    assert strategy.next_delay(watch("audio"), clip("streaming", age=10)) == pytest.approx(2)
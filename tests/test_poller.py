@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import FakeResponse
+from suno.poller import FeedPoller, PollStrategy
+from suno.suno_client import RetryPolicy, SunoRequestError
+
+
+class FlakyFeedClient:
+    """Cliente cuyo feed falla con ``errors`` antes de devolver los clips completos."""
+
+    def __init__(self, errors):
+        self._client = SimpleNamespace(retry_policy=RetryPolicy(), fingerprint="test")
+        self.errors = list(errors)
+        self.calls = 0
+
+    def get_songs_by_ids(self, ids):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return [SimpleNamespace(id=song_id, status="complete", model_name="chirp-v3") for song_id in ids]
+
+
+def watch_all(poller, ids, timeout=5):
+    return [
+        poller.watch(song_id, lambda song: song.status == "complete", timeout=timeout, interval=0.01)
+        for song_id in ids
+    ]
+
+
+def test_transient_feed_error_is_retried():
+    client = FlakyFeedClient([SunoRequestError("bad gateway", FakeResponse(502), 5), OSError("reset")])
+    poller = FeedPoller(client, strategy=PollStrategy())
+    watches = watch_all(poller, ["a", "b"])
+    assert [watch.result(timeout=5).id for watch in watches] == ["a", "b"]
+    assert client.calls >= 3
+
+
+def test_permanent_feed_error_fails_the_waits():
+    client = FlakyFeedClient([SunoRequestError("forbidden", FakeResponse(403), 1)])
+    poller = FeedPoller(client, strategy=PollStrategy())
+    watches = watch_all(poller, ["a", "b"])
+    for watch in watches:
+        with pytest.raises(SunoRequestError):
+            watch.result(timeout=5)
+
+
+def test_transient_feed_error_still_honours_the_deadline():
+    client = FlakyFeedClient([OSError("reset")] * 1000)
+    poller = FeedPoller(client, strategy=PollStrategy())
+    (watch,) = watch_all(poller, ["a"], timeout=0.1)
+    with pytest.raises(TimeoutError):
+        watch.result(timeout=5)
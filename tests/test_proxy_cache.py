@@ -0,0 +1,40 @@
+import asyncio
+import threading
+import time
+
+from suno import api
+
+
+def test_per_url_lock_survives_until_last_waiter(monkeypatch):
+    active = []
+    overlaps = []
+    lock = threading.Lock()
+
+    def fake_download(url, path):
+        with lock:
+            active.append(url)
+            overlaps.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(url)
+        return path
+
+    monkeypatch.setattr(api, "cached_download", fake_download)
+
+    url = "https://cdn1.suno.ai/clip_1.mp3"
+
+    async def late_fetch():
+        # Llega mientras la segunda petición descarga, tras liberar la primera el lock
+        await asyncio.sleep(0.08)
+        return await api.fetch_to_proxy_cache(url, "clip_1", "audio")
+
+    async def main():
+        await asyncio.gather(
+            api.fetch_to_proxy_cache(url, "clip_1", "audio"),
+            api.fetch_to_proxy_cache(url, "clip_1", "audio"),
+            late_fetch(),
+        )
+
+    asyncio.run(main())
+    assert overlaps == [1, 1, 1]
+    assert api._asset_locks == {}
@@ -0,0 +1,69 @@
+"""Token bucket por cuenta y cabecera Retry-After."""
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from suno import ratelimit
+from suno.ratelimit import TokenBucket, get_rate_limiter, retry_after_seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_burst_then_steady_rate(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    # Sin tokens, cada petición espera medio segundo más que la anterior
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_tokens_refill_up_to_burst(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    for _ in range(3):
+        bucket.reserve()
+    clock[0] += 1
+    assert [bucket.reserve() for _ in range(2)] == [0, 0]
+    assert bucket.reserve() > 0
+
+    clock[0] += 60
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    assert bucket.reserve() > 0
+
+
+def test_pause_blocks_every_request(clock):
+    bucket = TokenBucket(rate=0)
+    bucket.pause(10)
+    assert bucket.reserve() == pytest.approx(10)
+    clock[0] += 4
+    assert bucket.reserve() == pytest.approx(6)
+    # Una pausa más corta no acorta la vigente
+    bucket.pause(1)
+    assert bucket.reserve() == pytest.approx(6)
+    clock[0] += 6
+    assert bucket.reserve() == 0
+
+
+def test_pause_applies_on_top_of_the_rate(clock):
+    bucket = TokenBucket(rate=2, burst=1)
+    bucket.pause(3)
+    assert bucket.reserve() == pytest.approx(3)
+
+
+def test_limiter_is_shared_per_account():
+    assert get_rate_limiter("account_a") is get_rate_limiter("account_a")
+    assert get_rate_limiter("account_a") is not get_rate_limiter("account_b")
+
+
+def test_retry_after_seconds():
+    assert retry_after_seconds("12") == 12
+    assert retry_after_seconds("-3") == 0
+    assert retry_after_seconds(None) is None
+    assert retry_after_seconds("soon") is None
+    date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 < retry_after_seconds(date) <= 30
@@ -0,0 +1,68 @@
+"""Registro de clientes: expulsión LRU, por inactividad y clientes fijados por el pool."""
+import pytest
+
+from suno import registry
+from suno.accounts import AccountPool
+
+
+class FakeSuno:
+    def __init__(self, cookie):
+        self.cookie = cookie
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def fake_suno(monkeypatch):
+    monkeypatch.setattr(registry, "Suno", FakeSuno)
+
+
+def test_least_recently_used_client_is_closed():
+    clients = registry.ClientRegistry(max_clients=2)
+    a = clients.get("a=1")
+    b = clients.get("b=2")
+    assert clients.get("a=1") is a
+    clients.get("c=3")
+
+    assert b.closed and not a.closed
+    assert len(clients) == 2
+    assert clients.get("b=2") is not b
+
+
+def test_idle_clients_are_closed(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(registry.time, "monotonic", lambda: now[0])
+    clients = registry.ClientRegistry(max_clients=8, idle_ttl=60)
+    a = clients.get("a=1")
+    now[0] += 30
+    b = clients.get("b=2")
+    now[0] += 45
+
+    clients.get("c=3")
+    assert a.closed and not b.closed
+    assert len(clients) == 2
+
+
+def test_pinned_clients_are_never_evicted(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(registry.time, "monotonic", lambda: now[0])
+    clients = registry.ClientRegistry(max_clients=1, idle_ttl=60)
+    pinned = [clients.get(f"p={index}", pin=True) for index in range(3)]
+    now[0] += 120
+    clients.get("x=1")
+    clients.get("y=2")
+
+    assert not any(client.closed for client in pinned)
+    assert all(clients.get(f"p={index}") is pinned[index] for index in range(3))
+
+
+def test_pool_with_more_accounts_than_the_registry_keeps_its_clients(monkeypatch):
+    monkeypatch.setattr(registry, "_registry", registry.ClientRegistry(max_clients=2))
+    accounts = AccountPool([f"account={index}" for index in range(5)])
+    first = [account.client for account in accounts.accounts]
+    second = [account.client for account in accounts.accounts]
+
+    assert all(a is b for a, b in zip(first, second))
+    assert not any(client.closed for client in first)
@@ -0,0 +1,124 @@
+"""Clasificación de reintentos, presupuesto de tiempo y renovación tras un 401."""
+import time
+
+import pytest
+from curl_cffi import requests
+
+from suno.suno_client import URL_FEED, URL_SID, RetryPolicy, SunoRequestError
+from conftest import FakeResponse
+from test_auth import clerk_responder, run_with_timeout
+
+
+def test_retryable_statuses():
+    policy = RetryPolicy()
+    for status in (408, 425, 429, 500, 502, 503, 504):
+        assert policy.is_retryable_status(status)
+    for status in (400, 401, 403, 404, 409, 422):
+        assert not policy.is_retryable_status(status)
+
+
+def test_retryable_errors():
+    policy = RetryPolicy()
+    assert policy.is_retryable_error(requests.RequestsError("timeout"))
+    assert policy.is_retryable_error(ConnectionResetError())
+    assert not policy.is_retryable_error(ValueError("bad payload"))
+
+
+def test_next_delay_is_bounded():
+    policy = RetryPolicy(base_delay=0.5, max_delay=2)
+    delay = policy.base_delay
+    for _ in range(50):
+        delay = policy.next_delay(delay)
+        assert policy.base_delay <= delay <= policy.max_delay
+
+
+def test_non_retryable_status_fails_at_once(make_client):
+    client = make_client(lambda method, url, kwargs: FakeResponse(404, text="missing"))
+
+    with pytest.raises(SunoRequestError) as info:
+        client.request("GET", URL_FEED)
+    assert info.value.status_code == 404
+    assert info.value.attempts == 1
+    assert len(client.calls) == 1
+
+
+def test_transient_status_is_retried_until_max_attempts(make_client):
+    client = make_client(lambda method, url, kwargs: FakeResponse(502))
+
+    with pytest.raises(SunoRequestError) as info:
+        client.request("GET", URL_FEED)
+    assert info.value.status_code == 502
+    assert len(client.calls) == client.retry_policy.max_attempts
+
+
+def test_transport_error_is_retried_and_chained(make_client):
+    def responder(method, url, kwargs):
+        raise requests.RequestsError("connection reset")
+
+    client = make_client(responder)
+    with pytest.raises(SunoRequestError) as info:
+        client.request("GET", URL_FEED)
+    assert isinstance(info.value.__cause__, requests.RequestsError)
+    assert len(client.calls) == client.retry_policy.max_attempts
+
+
+def test_budget_stops_retries(make_client):
+    policy = RetryPolicy(max_attempts=10, base_delay=1, max_delay=1, budget=0.5)
+    client = make_client(lambda method, url, kwargs: FakeResponse(503), retry_policy=policy)
+
+    start = time.monotonic()
+    with pytest.raises(SunoRequestError):
+        client.request("GET", URL_FEED)
+    # El primer retraso (1 s) ya no cabe en el presupuesto: no se espera ni se reintenta
+    assert time.monotonic() - start < 0.5
+    assert len(client.calls) == 1
+
+
+def test_401_renews_jwt_and_retries(make_client):
+    def responder(method, url, kwargs):
+        if url == URL_FEED:
+            if kwargs["headers"].get("Authorization") != "Bearer header.payload.signature":
+                return FakeResponse(401)
+            return FakeResponse(json_data=[])
+        return clerk_responder(method, url, kwargs)
+
+    client = make_client(responder)
+
+    response = run_with_timeout(lambda: client.request("GET", URL_FEED))
+    assert response.status_code == 200
+    urls = [url for _, url, _ in client.calls]
+    assert urls == [URL_FEED, URL_SID, urls[2], URL_FEED]
+    assert "/tokens" in urls[2]
+
+
+def test_retry_after_beyond_budget_fails_at_once(make_client):
+    policy = RetryPolicy(max_attempts=5, base_delay=0.01, max_delay=0.02, budget=1)
+    client = make_client(lambda method, url, kwargs: FakeResponse(429, headers={"Retry-After": "3"}), retry_policy=policy)
+
+    start = time.monotonic()
+    with pytest.raises(SunoRequestError) as info:
+        client.request("GET", URL_FEED)
+    assert time.monotonic() - start < 0.5
+    assert info.value.status_code == 429
+    assert len(client.calls) == 1
+
+
+def test_retry_after_within_budget_is_honoured(make_client):
+    responses = [FakeResponse(429, headers={"Retry-After": "0.2"}), FakeResponse(json_data=[])]
+    client = make_client(lambda method, url, kwargs: responses.pop(0))
+
+    start = time.monotonic()
+    assert client.request("GET", URL_FEED).status_code == 200
+    assert time.monotonic() - start >= 0.2
+
+
+def test_cloudflare_wait_beyond_budget_fails_at_once(make_client):
+    policy = RetryPolicy(max_attempts=5, base_delay=0.01, max_delay=0.02, budget=1)
+    client = make_client(lambda method, url, kwargs: FakeResponse(503), retry_policy=policy)
+    client._is_cloudflare_challenge = lambda response: True
+
+    start = time.monotonic()
+    with pytest.raises(SunoRequestError) as info:
+        client.request("GET", URL_FEED)
+    assert time.monotonic() - start < 0.5
+    assert info.value.status_code == 503
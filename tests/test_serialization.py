@@ -0,0 +1,18 @@
+from suno import serialization
+from suno.suno_client import Song
+
+
+def test_song_is_encoded_by_its_fields_only():
+    song = Song(
+        id="clip_1", video_url="", audio_url="https://cdn1.suno.ai/clip_1.mp3",
+        major_model_version="v3", model_name="chirp-v3", metadata={"tags": "pop"},
+        is_liked=False, user_id="user_1", is_trashed=False, created_at="2024-01-01T00:00:00Z",
+        status="complete", title="t", play_count=0, upvote_count=0, is_public=False,
+    )
+    data = serialization.loads(serialization.dumps(song))
+    assert data["id"] == "clip_1"
+    assert "model_config" not in data
+
+
+def test_sets_and_tuples_become_lists():
+    assert serialization.loads(serialization.dumps({"a": (1, 2), "b": {3}})) == {"a": [1, 2], "b": [3]}
@@ -0,0 +1,75 @@
+"""Agrupación de consultas idénticas simultáneas en el proxy."""
+import asyncio
+
+import pytest
+
+from suno.api import SingleFlight
+
+
+def test_concurrent_calls_share_one_upstream_call():
+    flight = SingleFlight()
+    calls = []
+
+    async def lookup():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "song"
+
+    async def main():
+        return await asyncio.gather(*(flight.do("clip_1", lookup) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["song"] * 5
+    assert len(calls) == 1
+
+
+def test_different_keys_are_not_shared():
+    flight = SingleFlight()
+    calls = []
+
+    async def lookup(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return key
+
+    async def main():
+        return await asyncio.gather(flight.do("a", lambda: lookup("a")), flight.do("b", lambda: lookup("b")))
+
+    assert asyncio.run(main()) == ["a", "b"]
+    assert sorted(calls) == ["a", "b"]
+
+
+def test_error_reaches_every_waiter_and_is_not_cached():
+    flight = SingleFlight()
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def main():
+        results = await asyncio.gather(*(flight.do("clip_1", failing) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        # Terminada la llamada, la siguiente vuelve a consultar
+        with pytest.raises(RuntimeError):
+            await flight.do("clip_1", failing)
+
+    asyncio.run(main())
+    assert len(calls) == 2
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    flight = SingleFlight()
+
+    async def lookup():
+        await asyncio.sleep(0.02)
+        return "song"
+
+    async def main():
+        first = asyncio.ensure_future(flight.do("clip_1", lookup))
+        second = asyncio.ensure_future(flight.do("clip_1", lookup))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == "song"
@@ -0,0 +1,28 @@
+import pytest
+from pydantic import ValidationError
+
+from suno.suno_client import Song, _song_from_clip
+
+CLIP = {
+    "id": "clip_1", "video_url": "", "audio_url": "https://cdn1.suno.ai/clip_1.mp3",
+    "image_large_url": "https://cdn2.suno.ai/image_large_clip_1.jpeg",
+    "major_model_version": "v3", "model_name": "chirp-v3", "metadata": {"tags": "pop"},
+    "is_liked": False, "user_id": "user_1", "is_trashed": False, "created_at": "2024-01-01T00:00:00Z",
+    "status": "complete", "title": "t", "play_count": 0, "upvote_count": 0, "is_public": False,
+    "display_name": "tester",
+}
+
+
+def test_trusted_clip_matches_validated_song():
+    fast = _song_from_clip(CLIP)
+    assert fast == _song_from_clip(CLIP, validate=True)
+    assert fast.cover_image_url == CLIP["image_large_url"]
+    assert set(fast.__dict__) == set(Song.__fields__)
+    assert "model_config" not in fast.dict()
+    assert "cover_image_url" not in CLIP
+
+
+def test_incomplete_clip_is_validated():
+    clip = {key: value for key, value in CLIP.items() if key != "play_count"}
+    with pytest.raises(ValidationError, match="play_count"):
+        _song_from_clip(clip)
@@ -0,0 +1,66 @@
+"""Caché de /songs con ETag y respuestas 304."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from suno import api
+from suno.accounts import Account
+from test_api_accounts import song
+
+
+class FakeFeedClient:
+    def __init__(self):
+        self.feed = [song("clip_1", "2024-01-01T00:00:00Z")]
+        self.calls = 0
+
+    async def get_songs(self):
+        self.calls += 1
+        return self.feed
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = FakeFeedClient()
+    monkeypatch.setattr(Account, "async_client", property(lambda account: client))
+    api._song_listings.clear()
+    return client
+
+
+def get_songs(if_none_match=None):
+    headers = {"if-none-match": if_none_match} if if_none_match else {}
+    request = SimpleNamespace(headers=headers)
+    return asyncio.run(api.get_songs(request, cookie="listing=1", stream=False, max_pages=None))
+
+
+def test_listing_is_cached_within_ttl(client):
+    first = get_songs()
+    second = get_songs()
+    assert first.status_code == second.status_code == 200
+    assert first.body == second.body
+    assert client.calls == 1
+
+
+def test_matching_etag_returns_304(client):
+    etag = get_songs().headers["etag"]
+    assert get_songs(etag).status_code == 304
+    assert get_songs(f"W/{etag}").status_code == 304
+    assert get_songs(f'"other", {etag}').status_code == 304
+    assert get_songs('"other"').status_code == 200
+
+
+def test_wildcard_if_none_match_returns_304(client):
+    response = get_songs("*")
+    assert response.status_code == 304
+    assert response.headers["etag"]
+
+
+def test_etag_changes_with_the_feed(client, monkeypatch):
+    etag = get_songs().headers["etag"]
+    monkeypatch.setattr(api, "SONGS_CACHE_TTL", 0)
+    api._song_listings.clear()
+    client.feed = client.feed + [song("clip_2", "2024-01-02T00:00:00Z")]
+
+    response = get_songs(etag)
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag